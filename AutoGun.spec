@@ -1,5 +1,8 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
+# Вариант сборки задаёт build_pyinstaller.py --variant (release/debug)
+DEBUG_BUILD = os.environ.get('AUTOGUN_VARIANT') == 'debug'
 
 a = Analysis(
     ['main.py'],
@@ -10,7 +13,17 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Тяжёлые модули, которые приложение не использует (меньше exe и быстрее анализ).
+    # numpy НЕ исключаем - он нужен cv2 (weapon_category_detector)
+    excludes=[
+        'tkinter',
+        'test',
+        'pydoc',
+        'PyQt6.QtWebEngineCore',
+        'PyQt6.QtWebEngineWidgets',
+        'PyQt6.Qt3DCore',
+        'PyQt6.QtMultimedia',
+    ],
     noarchive=False,
     optimize=0,
 )
@@ -29,7 +42,7 @@ exe = EXE(
     upx=True,
     upx_exclude=[],
     runtime_tmpdir=None,
-    console=False,
+    console=DEBUG_BUILD,
     disable_windowed_traceback=False,
     argv_emulation=False,
     target_arch=None,
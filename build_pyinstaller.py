@@ -8,6 +8,11 @@ import subprocess
 import sys
 import os
 import shutil
+import argparse
+import tempfile
+import importlib.util
+import importlib.metadata
+from concurrent.futures import ThreadPoolExecutor
 
 def check_python_version():
     """Проверка версии Python"""
@@ -22,18 +27,62 @@ def check_python_version():
         input("\nНажмите Enter...")
         sys.exit(1)
 
+def _pefile_ok():
+    """Установлен ли pefile нужной версии (< 2024.8.26)"""
+    try:
+        version = importlib.metadata.version("pefile")
+    except importlib.metadata.PackageNotFoundError:
+        return False
+    
+    try:
+        return tuple(int(part) for part in version.split(".")[:3]) < (2024, 8, 26)
+    except ValueError:
+        return False
+
 def install_pyinstaller():
-    """Установка PyInstaller"""
+    """Установка PyInstaller (только если не установлен)"""
+    if importlib.util.find_spec("PyInstaller") is not None and _pefile_ok():
+        return
+    
     print("\n" + "=" * 50)
     print("  Установка PyInstaller...")
     print("=" * 50)
+    # pefile<2024.8.26: новые версии в разы замедляют анализ
+    # бинарных зависимостей на Windows (PyInstaller issue #8762)
     subprocess.run([
-        sys.executable, "-m", "pip", "install", 
-        "pyinstaller"
+        sys.executable, "-m", "pip", "install",
+        "--disable-pip-version-check", "--no-input", "--quiet",
+        "pyinstaller", "pefile<2024.8.26"
     ])
 
+def _fast_rm(path):
+    """
+    Быстрое удаление папки нативной командой ОС
+    
+    На больших build/ (десятки тысяч файлов) rd /s /q и rm -rf
+    заметно быстрее shutil.rmtree. При ошибке - fallback на shutil.
+    """
+    if os.name == 'nt':
+        cmd = ["cmd", "/c", "rd", "/s", "/q", path]
+    else:
+        cmd = ["rm", "-rf", path]
+    
+    try:
+        subprocess.run(cmd, check=False)
+    except OSError:
+        pass
+    
+    if os.path.exists(path):
+        shutil.rmtree(path, ignore_errors=True)
+
 def clean_build_dirs():
-    """Очистка предыдущих сборок"""
+    """
+    Очистка предыдущих сборок
+    
+    Вызывается только с флагом --fresh: кэш PyInstaller в build/
+    переиспользуется между сборками. Если изменился AutoGun.spec
+    или hidden imports - удалите build/ вручную или запустите с --fresh.
+    """
     print("\n" + "=" * 50)
     print("  Очистка предыдущих сборок...")
     print("=" * 50)
@@ -42,10 +91,80 @@ def clean_build_dirs():
     for dirname in dirs_to_clean:
         if os.path.exists(dirname):
             print(f"  Удаление: {dirname}/")
-            shutil.rmtree(dirname, ignore_errors=True)
+            _fast_rm(dirname)
 
-def compile_with_pyinstaller():
-    """Компиляция с PyInstaller"""
+def _run_pyinstaller(cmd, variant=None):
+    """
+    Запуск одной сборки PyInstaller
+    
+    Для варианта сборки (release/debug) используется отдельный
+    PYINSTALLER_CONFIG_DIR и свои build/<variant>, dist/<variant>,
+    чтобы параллельные сборки не портили кэш друг друга.
+    
+    Args:
+        cmd: Команда PyInstaller (последний элемент - spec или main.py)
+        variant: Название варианта сборки или None (обычная сборка)
+        
+    Returns:
+        Код возврата PyInstaller
+    """
+    env = None
+    if variant:
+        env = os.environ.copy()
+        env["AUTOGUN_VARIANT"] = variant
+        env["PYINSTALLER_CONFIG_DIR"] = os.path.join(
+            tempfile.gettempdir(), f"pyi-{os.getpid()}-{variant}"
+        )
+        cmd = cmd[:-1] + [
+            f"--workpath={os.path.join('build', variant)}",
+            f"--distpath={os.path.join('dist', variant)}",
+        ] + cmd[-1:]
+    
+    result = subprocess.run(cmd, env=env)
+    return result.returncode
+
+def _pyinstaller_command(use_spec, variant=None):
+    """
+    Команда PyInstaller для варианта сборки
+    
+    Args:
+        use_spec: Собирать по AutoGun.spec (вариант он читает из AUTOGUN_VARIANT)
+        variant: Название варианта сборки или None
+        
+    Returns:
+        Список аргументов команды
+    """
+    if use_spec:
+        return [
+            sys.executable, "-m", "PyInstaller",
+            "--noconfirm",       # Не спрашивать подтверждения
+            "AutoGun.spec"
+        ]
+    
+    # Fallback: сборка без spec-файла, консоль - только у debug (как в spec)
+    return [
+        sys.executable, "-m", "PyInstaller",
+        "--onefile",
+        "--console" if variant == "debug" else "--windowed",
+        "--name=AutoGun",
+        "--hidden-import=pymem",
+        "--hidden-import=keyboard",
+        "--hidden-import=mouse",
+        "--hidden-import=loguru",
+        "--hidden-import=yaml",
+        "--add-data=config;config",
+        "--add-data=data;data",
+        "main.py"
+    ]
+
+def compile_with_pyinstaller(variants=None):
+    """
+    Компиляция с PyInstaller
+    
+    Args:
+        variants: Список вариантов сборки для параллельного запуска
+                  (например ['release', 'debug']) или None
+    """
     print("\n" + "=" * 50)
     print("  КОМПИЛЯЦИЯ НАЧАЛАСЬ")
     print("  Это займёт 5-15 минут!")
@@ -53,57 +172,66 @@ def compile_with_pyinstaller():
     print("=" * 50 + "\n")
     
     # Используем готовый spec-файл
-    if os.path.exists("AutoGun.spec"):
+    use_spec = os.path.exists("AutoGun.spec")
+    if use_spec:
         print("  Используется AutoGun.spec\n")
-        cmd = [
-            sys.executable, "-m", "PyInstaller",
-            "--clean",           # Очистка перед сборкой
-            "--noconfirm",       # Не спрашивать подтверждения
-            "AutoGun.spec"
-        ]
     else:
-        # Fallback: сборка без spec-файла
         print("  ПРЕДУПРЕЖДЕНИЕ: AutoGun.spec не найден!")
         print("  Используется базовая конфигурация\n")
-        cmd = [
-            sys.executable, "-m", "PyInstaller",
-            "--onefile",
-            "--windowed",
-            "--name=AutoGun",
-            "--hidden-import=pymem",
-            "--hidden-import=keyboard",
-            "--hidden-import=mouse",
-            "--hidden-import=loguru",
-            "--hidden-import=yaml",
-            "--add-data=config;config",
-            "--add-data=data;data",
-            "main.py"
-        ]
     
-    result = subprocess.run(cmd)
-    return result.returncode
+    if not variants:
+        return _run_pyinstaller(_pyinstaller_command(use_spec))
+    
+    # Варианты собираются параллельно - каждый в своём процессе PyInstaller
+    print(f"  Параллельная сборка: {', '.join(variants)}\n")
+    with ThreadPoolExecutor(max_workers=len(variants)) as executor:
+        exit_codes = list(executor.map(
+            lambda v: _run_pyinstaller(_pyinstaller_command(use_spec, v), v), variants
+        ))
+    
+    for variant, code in zip(variants, exit_codes):
+        if code != 0:
+            print(f"  ✗ Вариант {variant}: код {code}")
+            return code
+    return 0
 
-def copy_exe_to_root():
-    """Копирование exe в корень проекта"""
-    dist_exe = os.path.join("dist", "AutoGun.exe")
-    root_exe = "AutoGun.exe"
+def _root_exe_name(variant=None):
+    """Имя exe в корне проекта для варианта сборки"""
+    if not variant or variant == "release":
+        return "AutoGun.exe"
+    return f"AutoGun_{variant}.exe"
+
+def copy_exe_to_root(variant=None):
+    """Перенос exe в корень проекта"""
+    if variant:
+        dist_exe = os.path.join("dist", variant, "AutoGun.exe")
+    else:
+        dist_exe = os.path.join("dist", "AutoGun.exe")
+    root_exe = _root_exe_name(variant)
     
     if os.path.exists(dist_exe):
         print("\n" + "=" * 50)
-        print("  Копирование AutoGun.exe в корень...")
+        print(f"  Копирование {root_exe} в корень...")
         print("=" * 50)
         
-        # Удаляем старый exe если есть
-        if os.path.exists(root_exe):
-            os.remove(root_exe)
-        
-        # Копируем новый
-        shutil.copy2(dist_exe, root_exe)
+        # Атомарное перемещение вместо копирования (старый exe подменяется сразу)
+        try:
+            os.replace(dist_exe, root_exe)
+        except OSError:
+            # Другой диск - перемещение невозможно, копируем
+            shutil.copy2(dist_exe, root_exe)
         return True
     return False
 
 def main():
     """Главная функция"""
+    parser = argparse.ArgumentParser(description="Компиляция AutoGun с PyInstaller")
+    parser.add_argument('--fresh', action='store_true',
+                        help='Полная пересборка (удалить build/ и dist/)')
+    parser.add_argument('--variant', action='append', choices=['release', 'debug'],
+                        help='Вариант сборки (можно указать несколько - соберутся параллельно)')
+    args = parser.parse_args()
+    
     print("=" * 50)
     print("  Компиляция AutoGun с PyInstaller")
     print("=" * 50)
@@ -111,24 +239,28 @@ def main():
     # Проверка версии
     check_python_version()
     
-    # Установка PyInstaller
+    # Установка PyInstaller (pip запускается только если его нет)
     install_pyinstaller()
     
-    # Очистка
-    clean_build_dirs()
+    # Очистка (только по запросу - иначе используется кэш build/)
+    if args.fresh:
+        clean_build_dirs()
     
     # Компиляция
-    exit_code = compile_with_pyinstaller()
+    exit_code = compile_with_pyinstaller(args.variant)
     
     # Результат
     print("\n" + "=" * 50)
     if exit_code == 0:
-        if copy_exe_to_root():
+        variants = args.variant or [None]
+        if all([copy_exe_to_root(v) for v in variants]):
             print("  ✓ УСПЕШНО!")
-            print("  Файл: AutoGun.exe")
-            if os.path.exists("AutoGun.exe"):
-                size_mb = os.path.getsize("AutoGun.exe") / (1024 * 1024)
-                print(f"  Размер: {size_mb:.1f} МБ")
+            for variant in variants:
+                root_exe = _root_exe_name(variant)
+                print(f"  Файл: {root_exe}")
+                if os.path.exists(root_exe):
+                    size_mb = os.path.getsize(root_exe) / (1024 * 1024)
+                    print(f"  Размер: {size_mb:.1f} МБ")
             print()
             print("  ВАЖНО:")
             print("  - Запускайте AutoGun.exe из этой папки")
@@ -8,7 +8,7 @@ import time
 import argparse
 
 from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import QTimer, Qt
 
 from src.utils.logger import setup_logger
 from src.utils.config_manager import ConfigManager
@@ -17,8 +17,28 @@ from src.core.weapon_category_detector import WeaponCategoryDetector
 from src.core.macro_engine import MacroEngine
 from src.core.trigger_bot import TriggerBot
 from src.core.auto_jump import AutoJump
+from src.utils.input_state import InputState
+from src.utils.game_window import find_game_window
 from src.gui.main_window import MainWindow
 
+try:
+    import win32gui
+    WIN32_AVAILABLE = True
+except ImportError:
+    WIN32_AVAILABLE = False
+
+
+# Названия категорий оружия для отладочного вывода (индекс = ID категории)
+_CAT_NAMES = ("", "Основное", "Пистолет", "Холодное", "Специальное", "Снайперка", "Тяжёлое")
+
+# Как часто проверять подключение/окно игры, пока она не в фокусе (сек)
+_UNFOCUSED_CHECK_S = 0.5
+
+# Адаптивная частота тика: после стольких тиков без изменений патронов
+# таймер переходит на редкий интервал (мс), при любом изменении - обратно
+_IDLE_TICKS = 30
+_IDLE_INTERVAL_MS = 50
+
 
 class AmmoTracker:
     """Главный класс приложения"""
@@ -48,26 +68,43 @@ class AmmoTracker:
         self.memory_reader = MemoryReader(process_name)
         self.weapon_detector = WeaponCategoryDetector()
         self.macro_engine = MacroEngine(self.config)
-        self.trigger_bot = TriggerBot(self.memory_reader)
-        self.auto_jump = AutoJump(self.config)
+        self.input_state = InputState()
+        self.trigger_bot = TriggerBot(self.memory_reader, self.input_state)
+        self.auto_jump = AutoJump(self.config, self.input_state)
         
         # Загрузка оффсетов из конфига
         offsets = self.config.get('memory_reading.offsets', {})
-        if any(offsets.values()):
+        self._has_offsets = any(offsets.values())
+        if self._has_offsets:
             self.memory_reader.set_offsets(offsets)
             self.logger.info("Оффсеты загружены из конфига")
         else:
             self.logger.warning("⚠️ Оффсеты не установлены! См. MEMORY_OFFSETS_GUIDE.md")
         
+        # Настройки, которые не меняются во время работы (не читаем конфиг каждый тик)
+        self._auto_reconnect = bool(self.config.get('memory_reading.auto_reconnect', True))
+        self._pause_unfocused = WIN32_AVAILABLE and bool(self.config.get('memory_reading.pause_when_unfocused', True))
+        
         # Переменные состояния
         self.is_tracking = False
         self.all_ammo = {}  # Патроны всех 6 слотов
+        self._last_ammo_block = None  # Сырой блок слотов, отрисованный в GUI
+        self._last_emitted_ammo = {}  # Патроны, отрисованные в GUI
         self.fps_counter = 0
-        self.fps_last_time = time.time()
+        self.fps_last_time = time.monotonic()
         self.current_fps = 0.0
         
+        # Окно игры (кэш между тиками) - пока оно не в фокусе, тик не работает
+        self._game_hwnd = None
+        self._game_focused = True
+        self._unfocused_check_time = 0.0
+        
+        # Адаптивная частота тика
+        self._active_interval = 0  # Интервал из настроек (мс)
+        self._idle_ticks = 0
+        
         # Для режима отладки
-        self.debug_last_time = time.time()
+        self.debug_last_time = time.monotonic()
         self.debug_interval = 10  # Вывод каждые 10 секунд
         
         # GUI
@@ -95,6 +132,7 @@ class AmmoTracker:
         
         # Таймер обновления
         self.update_timer = QTimer()
+        self.update_timer.setTimerType(Qt.TimerType.CoarseTimer)
         self.update_timer.timeout.connect(self.update_tracking)
         
         # Показываем окно
@@ -122,7 +160,7 @@ class AmmoTracker:
             self.main_window.update_connection_status(status.replace("✅", "").replace("⚠️", "").strip(), "green")
             self.main_window.add_log("✅ Подключено к игре!")
             
-            if not any(self.config.get('memory_reading.offsets', {}).values()):
+            if not self._has_offsets:
                 self.main_window.add_log("⚠️ Оффсеты не установлены! См. MEMORY_OFFSETS_GUIDE.md")
         else:
             self.main_window.update_connection_status("Не подключено", "red")
@@ -138,10 +176,19 @@ class AmmoTracker:
         
         self.is_tracking = True
         
+        # Привязанные методы GUI для горячего цикла
+        self._update_all_weapons = self.main_window.update_all_weapons
+        self._update_fps = self.main_window.update_fps
+        
+        self._game_hwnd = find_game_window()
+        self._game_focused = True
+        
         # Получаем частоту обновления из GUI
         update_rate = self.main_window.get_update_rate()
         interval = int(1000 / update_rate)  # Конвертируем в миллисекунды
         
+        self._active_interval = interval
+        self._idle_ticks = 0
         self.update_timer.start(interval)
         self.logger.info(f"Отслеживание запущено (обновление: {update_rate} Hz)")
     
@@ -158,73 +205,135 @@ class AmmoTracker:
             return
         
         try:
+            # Игра не в фокусе - только редкая проверка подключения, без чтения и отрисовки
+            if self._pause_unfocused:
+                if not self._game_hwnd:
+                    # Окна ещё (или уже) нет - ищем его с той же редкой частотой
+                    now = time.monotonic()
+                    if now - self._unfocused_check_time >= _UNFOCUSED_CHECK_S:
+                        self._unfocused_check_time = now
+                        self._game_hwnd = find_game_window()
+                
+                if self._game_hwnd:
+                    if win32gui.GetForegroundWindow() != self._game_hwnd:
+                        self._on_game_unfocused()
+                        return
+                    if not self._game_focused:
+                        self._game_focused = True
+                        self._idle_ticks = 0
+                        self._set_idle_rate(False)
+                        self.trigger_bot.resume()
+            
             # Проверяем подключение
             if not self.memory_reader.is_connected():
                 self.logger.warning("Потеряно подключение к игре")
-                if self.config.get('memory_reading.auto_reconnect', True):
+                if self._auto_reconnect:
                     self.reconnect_to_game()
                 return
             
             # Читаем патроны всех 6 слотов
             self.all_ammo = self.memory_reader.read_all_ammo()
             
-            # Обновляем GUI для ВСЕХ оружий сразу
-            self.main_window.update_all_weapons(self.all_ammo)
-            
-            # Обновляем движок макросов
-            self.macro_engine.update(self.all_ammo)
+            # Обновляем GUI только для изменившихся слотов
+            # (сначала дешёвое сравнение сырого блока памяти)
+            ammo_block = self.memory_reader.ammo_block
+            if ammo_block != self._last_ammo_block:
+                last = self._last_emitted_ammo
+                changed = {k: v for k, v in self.all_ammo.items() if last.get(k) != v}
+                if changed:
+                    self._update_all_weapons(changed)
+                    self._last_emitted_ammo = self.all_ammo.copy()
+                self._last_ammo_block = ammo_block
+                
+                # Стрельба - возвращаем полную частоту
+                self._idle_ticks = 0
+                self._set_idle_rate(False)
+            else:
+                self._idle_ticks += 1
+                if self._idle_ticks >= _IDLE_TICKS:
+                    # Триггер-бот и Auto Jump реагируют не на патроны - им нужна полная частота
+                    self._set_idle_rate(not (self.trigger_bot.enabled or self.auto_jump.enabled))
             
-            # Обновляем триггер-бот
-            self.trigger_bot.update()
+            # Движок макросов (в своём потоке; массивы патронов заполняет memory reader)
+            if self.all_ammo:
+                reader = self.memory_reader
+                self.macro_engine.push_ammo(reader.clip_ammo, reader.reserve_ammo, version=reader.ammo_version)
+            else:
+                self.macro_engine.reset_ammo()
             
-            # Обновляем Auto Jump
-            self.auto_jump.update()
+            # Триггер-бот и Auto Jump - один общий опрос ввода за тик
+            self.input_state.poll()
             
             # Обновление FPS
             self.fps_counter += 1
-            current_time = time.time()
-            if current_time - self.fps_last_time >= 1.0:
-                self.current_fps = self.fps_counter / (current_time - self.fps_last_time)
-                self.main_window.update_fps(self.current_fps)
+            now = time.monotonic()
+            if now - self.fps_last_time >= 1.0:
+                self.current_fps = self.fps_counter / (now - self.fps_last_time)
+                self._update_fps(self.current_fps)
                 self.fps_counter = 0
-                self.fps_last_time = current_time
+                self.fps_last_time = now
             
             # Режим отладки - вывод всех патронов каждые 10 секунд
-            if self.main_window.is_debug_mode():
-                if current_time - self.debug_last_time >= self.debug_interval:
+            # (сначала дешёвая проверка времени, потом обращение к GUI)
+            if now - self.debug_last_time >= self.debug_interval:
+                if self.main_window.is_debug_mode():
                     self._debug_print_all_ammo()
-                    self.debug_last_time = current_time
+                    self.debug_last_time = now
         
         except Exception as e:
             self.logger.error(f"Ошибка в update_tracking: {e}", exc_info=True)
     
+    def _set_idle_rate(self, idle: bool):
+        """
+        Переключить частоту тика
+        
+        Args:
+            idle: True - редкий тик в простое, False - частота из настроек
+        """
+        interval = max(self._active_interval, _IDLE_INTERVAL_MS) if idle else self._active_interval
+        if self.update_timer.interval() != interval:
+            self.update_timer.setInterval(interval)
+    
+    def _on_game_unfocused(self):
+        """Тик, пока окно игры не в фокусе"""
+        # Не оставляем ЛКМ зажатой в фоне и не читаем прицел в фоне.
+        # Каждый тик: триггер-бот могли включить из GUI, пока игра не в фокусе
+        self.trigger_bot.pause()
+        
+        if self._game_focused:
+            self._game_focused = False
+            self.auto_jump.clear_pending()
+            self._set_idle_rate(True)
+        
+        now = time.monotonic()
+        if now - self._unfocused_check_time < _UNFOCUSED_CHECK_S:
+            return
+        self._unfocused_check_time = now
+        
+        if not win32gui.IsWindow(self._game_hwnd):
+            self._game_hwnd = find_game_window()
+        
+        if not self.memory_reader.is_connected():
+            self.logger.warning("Потеряно подключение к игре")
+            if self._auto_reconnect:
+                self.reconnect_to_game()
+    
     def _debug_print_all_ammo(self):
-        """Вывод патронов всех категорий в режиме отладки"""
-        debug_msg = "=== ОТЛАДКА: Патроны всех оружий ==="
-        self.main_window.add_log(debug_msg)
-        
-        category_names = {
-            1: "Основное",
-            2: "Пистолет",
-            3: "Холодное",
-            4: "Специальное",
-            5: "Снайперка",
-            6: "Тяжёлое"
-        }
+        """Вывод патронов всех категорий в режиме отладки (одной записью в лог)"""
+        lines = ["=== ОТЛАДКА: Патроны всех оружий ==="]
         
         for cat_id in range(1, 7):
+            name = _CAT_NAMES[cat_id]
             if cat_id in self.all_ammo:
                 clip, reserve = self.all_ammo[cat_id]
-                total = clip + reserve
-                msg = f"  [{cat_id}] {category_names[cat_id]}: {clip}/{reserve} (всего: {total}) ✓"
+                lines.append("  [%d] %s: %d/%d (всего: %d) ✓" % (cat_id, name, clip, reserve, clip + reserve))
             elif cat_id == 3:
-                msg = f"  [{cat_id}] {category_names[cat_id]}: -- (холодное)"
+                lines.append("  [%d] %s: -- (холодное)" % (cat_id, name))
             else:
-                msg = f"  [{cat_id}] {category_names[cat_id]}: -- (нет данных)"
-            
-            self.main_window.add_log(msg)
+                lines.append("  [%d] %s: -- (нет данных)" % (cat_id, name))
         
-        self.main_window.add_log("=" * 40)
+        lines.append("=" * 40)
+        self.main_window.add_log("\n".join(lines))
     
     def on_macros_toggled(self, enabled: bool):
         """Обработчик вкл/выкл макросов"""
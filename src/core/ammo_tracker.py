@@ -2,11 +2,22 @@
 Модуль отслеживания патронов для всех 6 слотов оружия
 """
 
+import time
+from collections import deque, namedtuple
 from typing import Dict, Optional, Tuple
 import numpy as np
 from loguru import logger
 
 
+# Количество слотов оружия
+SLOT_COUNT = 6
+
+# Максимум записей в истории изменений (старые вытесняются)
+HISTORY_LIMIT = 4096
+
+# Запись истории изменений патронов
+AmmoChange = namedtuple('AmmoChange', ['slot', 'current', 'max', 'timestamp'])
+
 class AmmoTracker:
     """
     Класс для отслеживания патронов всех 6 категорий оружия одновременно
@@ -14,18 +25,14 @@ class AmmoTracker:
     
     def __init__(self):
         """Инициализация трекера патронов"""
-        # Состояние патронов для каждого слота
-        self.ammo_state = {
-            1: {"current": 0, "max": 0, "last_update": 0},
-            2: {"current": 0, "max": 0, "last_update": 0},
-            3: {"current": 0, "max": 0, "last_update": 0},  # Холодное - всегда 0
-            4: {"current": 0, "max": 0, "last_update": 0},
-            5: {"current": 0, "max": 0, "last_update": 0},
-            6: {"current": 0, "max": 0, "last_update": 0},
-        }
+        # Состояние патронов - параллельные массивы, индекс = slot_id (0 не используется)
+        # Слот 3 (холодное) - всегда 0
+        self._cur = np.zeros(SLOT_COUNT + 1, np.int32)
+        self._max = np.zeros(SLOT_COUNT + 1, np.int32)
+        self._ts = np.zeros(SLOT_COUNT + 1, np.float64)
         
-        # История изменений
-        self.history = []
+        # История изменений (кольцевой буфер)
+        self.history = deque(maxlen=HISTORY_LIMIT)
         
         logger.info("AmmoTracker инициализирован")
     
@@ -38,27 +45,21 @@ class AmmoTracker:
             current: Текущее количество патронов
             maximum: Максимальное количество патронов
         """
-        if slot_id not in self.ammo_state:
+        if not 1 <= slot_id <= SLOT_COUNT:
             logger.warning(f"Некорректный slot_id: {slot_id}")
             return
         
-        import time
-        
         # Обновляем состояние
-        old_current = self.ammo_state[slot_id]["current"]
-        self.ammo_state[slot_id]["current"] = current
-        self.ammo_state[slot_id]["max"] = maximum
-        self.ammo_state[slot_id]["last_update"] = time.time()
+        old_current = int(self._cur[slot_id])
+        self._cur[slot_id] = current
+        self._max[slot_id] = maximum
+        now = time.time()
+        self._ts[slot_id] = now
         
         # Логируем изменения
         if old_current != current:
             logger.debug(f"Слот {slot_id}: {current}/{maximum}")
-            self.history.append({
-                "slot": slot_id,
-                "current": current,
-                "max": maximum,
-                "timestamp": time.time()
-            })
+            self.history.append(AmmoChange(slot_id, current, maximum, now))
     
     def get_slot_ammo(self, slot_id: int) -> Tuple[int, int]:
         """
@@ -70,11 +71,10 @@ class AmmoTracker:
         Returns:
             Tuple(current, max)
         """
-        if slot_id not in self.ammo_state:
+        if not 1 <= slot_id <= SLOT_COUNT:
             return (0, 0)
         
-        state = self.ammo_state[slot_id]
-        return (state["current"], state["max"])
+        return (int(self._cur[slot_id]), int(self._max[slot_id]))
     
     def get_all_ammo(self) -> Dict[int, Tuple[int, int]]:
         """
@@ -84,8 +84,8 @@ class AmmoTracker:
             Dict {slot_id: (current, max)}
         """
         return {
-            slot_id: (state["current"], state["max"])
-            for slot_id, state in self.ammo_state.items()
+            slot_id: (int(self._cur[slot_id]), int(self._max[slot_id]))
+            for slot_id in range(1, SLOT_COUNT + 1)
         }
     
     def has_ammo(self, slot_id: int, min_amount: int = 1) -> bool:
@@ -127,24 +127,27 @@ class AmmoTracker:
         Returns:
             ID слота с наибольшим количеством патронов или None
         """
-        best_slot = None
-        best_percent = -1
+        # Пропускаем холодное
+        candidates = [slot_id for slot_id in slot_ids if slot_id != 3]
+        if not candidates:
+            return None
         
-        for slot_id in slot_ids:
-            if slot_id == 3:  # Пропускаем холодное
-                continue
-            
-            percent = self.get_ammo_percent(slot_id)
-            if percent > best_percent:
-                best_percent = percent
-                best_slot = slot_id
+        # Доля патронов для всех слотов сразу (0 если максимум неизвестен)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fill = np.where(self._max > 0, self._cur / self._max, 0.0)
+        
+        ids = np.asarray(candidates)
+        valid = (ids >= 1) & (ids <= SLOT_COUNT)
+        scores = np.where(valid, fill[np.clip(ids, 0, SLOT_COUNT)], 0.0)
         
-        return best_slot
+        # argmax берёт первый максимум - как и прежний проход по списку
+        return candidates[int(np.argmax(scores))]
     
     def reset(self):
         """Сброс всех данных"""
-        for slot_id in self.ammo_state:
-            self.ammo_state[slot_id] = {"current": 0, "max": 0, "last_update": 0}
+        self._cur.fill(0)
+        self._max.fill(0)
+        self._ts.fill(0)
         self.history.clear()
         logger.info("AmmoTracker сброшен")
     
@@ -156,7 +159,7 @@ class AmmoTracker:
             Строка с информацией
         """
         lines = ["Патроны:"]
-        for slot_id in sorted(self.ammo_state.keys()):
+        for slot_id in range(1, SLOT_COUNT + 1):
             current, maximum = self.get_slot_ammo(slot_id)
             if slot_id == 3:
                 lines.append(f"  {slot_id}: Холодное оружие")
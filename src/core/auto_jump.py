@@ -3,10 +3,40 @@
 """
 
 import time
+import ctypes
 import threading
+from collections import deque
 import keyboard
 from loguru import logger
 
+from src.utils.send_input import make_key_inputs, send_input
+from src.utils.keyboard_hook import KeyboardHook, HOOK_AVAILABLE
+from src.utils.game_window import find_game_window
+
+VK_SPACE = 0x20
+
+try:
+    _winmm = ctypes.WinDLL('winmm')
+except (AttributeError, OSError):
+    _winmm = None
+
+
+def _precise_sleep(seconds: float):
+    """
+    Точная задержка: time.sleep на основную часть + добивка perf_counter
+    
+    Обычный time.sleep на Windows кратен ~15.6мс, поэтому 10мс
+    между прыжками без этого недостижимы.
+    
+    Args:
+        seconds: Длительность в секундах
+    """
+    end = time.perf_counter() + seconds
+    if seconds > 0.003:
+        time.sleep(seconds - 0.002)
+    while time.perf_counter() < end:
+        pass
+
 try:
     import win32api
     import win32con
@@ -20,12 +50,13 @@ except ImportError:
 class AutoJump:
     """Автоматические повторные прыжки при нажатии пробела"""
     
-    def __init__(self, config_manager):
+    def __init__(self, config_manager, input_state=None):
         """
         Инициализация
         
         Args:
             config_manager: Менеджер конфигурации
+            input_state: Общий опрос ввода (InputState), если есть
         """
         if not WIN32_AVAILABLE:
             raise ImportError("pywin32 не установлен!")
@@ -42,19 +73,37 @@ class AutoJump:
         # Состояние пробела (для отслеживания нажатия/отпускания)
         self.was_pressed = False
         
-        # Флаг выполнения автопрыжков
+        # Поднято ли разрешение системного таймера (timeBeginPeriod)
+        self._timer_period_set = False
+        
+        # Флаг выполнения автопрыжков (пишет только рабочий поток)
         self.is_jumping = False
         
+        # Предсобранные INPUT (нажатие, отпускание) для SendInput
+        self._jump_inputs = None
+        
+        # Нажатия пробела из хука клавиатуры (deque.append потокобезопасен)
+        self._events = deque()
+        self._space_down = False
+        self._hook = KeyboardHook(self._on_key) if HOOK_AVAILABLE else None
+        
+        # Один постоянный рабочий поток вместо потока на каждую серию прыжков
+        self._trigger = threading.Event()
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
+        
+        # Опрос пробела через общий InputState (только когда нет хука)
+        self._input_state = input_state
+        self._polling = False
+        if input_state is not None:
+            input_state.subscribe(self._on_input)
+        
         logger.info("AutoJump инициализирован")
     
     def enable(self):
         """Включить функцию"""
         # Ищем окно игры
-        self.game_hwnd = win32gui.FindWindow(None, "Pixel Gun 3D")
-        
-        if not self.game_hwnd:
-            # Пробуем альтернативные названия
-            self.game_hwnd = win32gui.FindWindow(None, "Pixel Gun 3D - Unity")
+        self.game_hwnd = find_game_window()
         
         if not self.game_hwnd:
             logger.error("❌ Окно игры не найдено!")
@@ -65,9 +114,27 @@ class AutoJump:
         self.repeat_count = self.config.get('auto_jump.repeat_count', 2)
         self.delay_ms = self.config.get('auto_jump.delay_ms', 100)
         
+        # Скан-код клавиши прыжка резолвим один раз
+        self._jump_inputs = make_key_inputs(self.jump_key)
+        if self._jump_inputs is None:
+            logger.warning(f"[AUTO_JUMP] SendInput недоступен для '{self.jump_key}', используется keyboard")
+        
+        # Разрешение системного таймера 1мс на время работы функции
+        if _winmm and not self._timer_period_set:
+            _winmm.timeBeginPeriod(1)
+            self._timer_period_set = True
+        
         self.enabled = True
         self.was_pressed = False
-        self.is_jumping = False
+        self._trigger.clear()
+        self._events.clear()
+        self._space_down = False
+        
+        # Хук клавиатуры вместо опроса GetAsyncKeyState каждый тик
+        if self._hook and not self._hook.start():
+            logger.warning("[AUTO_JUMP] Хук клавиатуры не установлен, используется опрос")
+        self._set_polling(not (self._hook and self._hook.is_running()))
+        
         logger.info(f"✅ AutoJump ВКЛЮЧЕН (HWND: {self.game_hwnd}, повторов: {self.repeat_count}, задержка: {self.delay_ms}мс)")
         return True
     
@@ -75,30 +142,52 @@ class AutoJump:
         """Выключить функцию"""
         self.enabled = False
         self.was_pressed = False
-        self.is_jumping = False
+        self._trigger.clear()
+        if self._hook:
+            self._hook.stop()
+        self._set_polling(False)
+        self._events.clear()
+        if self._timer_period_set:
+            _winmm.timeEndPeriod(1)
+            self._timer_period_set = False
         logger.info("⏸ AutoJump ВЫКЛЮЧЕН")
     
-    def update(self):
-        """Обновление (вызывается в основном цикле)"""
+    def update(self, keys=None, foreground=None):
+        """
+        Обновление (вызывается в основном цикле)
+        
+        Args:
+            keys: Состояние клавиш из InputState (None - опросить самостоятельно)
+            foreground: HWND активного окна из InputState
+        """
         if not self.enabled:
             return
         
+        if self._hook and self._hook.is_running():
+            # События приходят из хука - в простое ничего не делаем
+            if self._events:
+                self._events.clear()
+                if not self._is_busy() and self._is_game_window_active():
+                    self._trigger.set()
+            return
+        
         try:
             # Проверяем состояние пробела через GetAsyncKeyState
             # VK_SPACE = 0x20
-            space_state = win32api.GetAsyncKeyState(0x20)
-            is_pressed = (space_state & 0x8000) != 0
+            if keys and VK_SPACE in keys:
+                is_pressed = keys[VK_SPACE]
+            else:
+                space_state = win32api.GetAsyncKeyState(VK_SPACE)
+                is_pressed = (space_state & 0x8000) != 0
             
             # Обрабатываем только момент нажатия (переход из False в True)
             if is_pressed and not self.was_pressed:
                 # Проверяем что не выполняются другие прыжки
-                if not self.is_jumping:
+                if not self._is_busy():
                     # Проверяем что окно игры активно
-                    if self._is_game_window_active():
-                        # Запускаем автопрыжки в отдельном потоке
-                        self.is_jumping = True
-                        jump_thread = threading.Thread(target=self._perform_auto_jumps, daemon=True)
-                        jump_thread.start()
+                    if self._is_game_window_active(foreground):
+                        # Будим рабочий поток
+                        self._trigger.set()
             
             # Сохраняем состояние для следующего кадра
             self.was_pressed = is_pressed
@@ -106,22 +195,78 @@ class AutoJump:
         except Exception as e:
             logger.error(f"[AUTO_JUMP] Ошибка в update: {e}")
     
-    def _is_game_window_active(self):
+    def _on_input(self, keys, foreground):
+        """Подписчик InputState"""
+        self.update(keys, foreground)
+    
+    def _set_polling(self, polling: bool):
+        """Включить/выключить опрос пробела в общем InputState"""
+        if self._input_state is None or polling == self._polling:
+            return
+        if polling:
+            self._input_state.track(VK_SPACE)
+        else:
+            self._input_state.untrack(VK_SPACE)
+        self._polling = polling
+    
+    def _is_busy(self) -> bool:
+        """Серия прыжков уже запрошена или выполняется"""
+        return self.is_jumping or self._trigger.is_set()
+    
+    def _worker_loop(self):
+        """Рабочий поток: ждёт запроса и выполняет серию прыжков"""
+        while True:
+            self._trigger.wait()
+            # Сначала флаг, потом сброс события - update() не увидит "окно" между ними
+            self.is_jumping = True
+            self._trigger.clear()
+            try:
+                self._perform_auto_jumps()
+            finally:
+                self.is_jumping = False
+    
+    def _on_key(self, vk_code: int, is_down: bool):
+        """
+        Обработчик хука клавиатуры (вызывается из потока хука)
+        
+        Args:
+            vk_code: Виртуальный код клавиши
+            is_down: True - нажатие, False - отпускание
+        """
+        if vk_code != VK_SPACE:
+            return
+        
+        # Только момент нажатия - автоповтор при удержании игнорируем.
+        # Пробел в других окнах (чат, браузер) не копим - иначе серия прыжков
+        # сработает на первом тике после возврата в игру
+        if is_down and not self._space_down:
+            if self.game_hwnd and win32gui.GetForegroundWindow() == self.game_hwnd:
+                self._events.append(True)
+        self._space_down = is_down
+    
+    def clear_pending(self):
+        """Сбросить накопленные нажатия пробела (например, при потере фокуса окном игры)"""
+        self._events.clear()
+    
+    def _is_game_window_active(self, foreground=None):
         """
         Проверить что окно игры активно (в фокусе)
         
+        Args:
+            foreground: Уже полученный HWND активного окна (None - запросить)
+        
         Returns:
             True если окно игры активно
         """
         try:
             if not self.game_hwnd or not win32gui.IsWindow(self.game_hwnd):
                 # Пытаемся найти окно заново
-                self.game_hwnd = win32gui.FindWindow(None, "Pixel Gun 3D")
+                self.game_hwnd = find_game_window()
                 if not self.game_hwnd:
                     return False
             
             # Получаем активное окно
-            active_hwnd = win32gui.GetForegroundWindow()
+            active_hwnd = foreground if foreground is not None else win32gui.GetForegroundWindow()
             
             # Проверяем что активное окно = окно игры
             return active_hwnd == self.game_hwnd
@@ -131,13 +276,15 @@ class AutoJump:
             return False
     
     def _perform_auto_jumps(self):
-        """Выполнить серию автоматических прыжков (в отдельном потоке)"""
+        """Выполнить серию автоматических прыжков (в рабочем потоке)"""
+        jump_inputs = self._jump_inputs
+        
         try:
             logger.info(f"[AUTO_JUMP] 🦘 Начало автопрыжков (x{self.repeat_count})")
             
             # Небольшая задержка перед первым повторным прыжком
             # (чтобы не конфликтовать с оригинальным нажатием пользователя)
-            time.sleep(self.delay_ms / 1000.0)
+            _precise_sleep(self.delay_ms / 1000.0)
             
             # Выполняем повторные прыжки
             for i in range(self.repeat_count):
@@ -146,23 +293,25 @@ class AutoJump:
                     break
                 
                 # Симулируем нажатие пробела
-                keyboard.press(self.jump_key)
-                time.sleep(0.05)  # Короткое нажатие (50мс)
-                keyboard.release(self.jump_key)
+                if jump_inputs:
+                    send_input(jump_inputs[0])
+                    _precise_sleep(0.05)  # Короткое нажатие (50мс)
+                    send_input(jump_inputs[1])
+                else:
+                    keyboard.press(self.jump_key)
+                    _precise_sleep(0.05)
+                    keyboard.release(self.jump_key)
                 
                 logger.debug(f"[AUTO_JUMP] Прыжок {i+1}/{self.repeat_count}")
                 
                 # Задержка перед следующим прыжком (кроме последнего)
                 if i < self.repeat_count - 1:
-                    time.sleep(self.delay_ms / 1000.0)
+                    _precise_sleep(self.delay_ms / 1000.0)
             
             logger.info(f"[AUTO_JUMP] ✅ Автопрыжки завершены")
             
         except Exception as e:
             logger.error(f"[AUTO_JUMP] Ошибка выполнения: {e}")
-        
-        finally:
-            self.is_jumping = False
     
     def set_repeat_count(self, count: int):
         """
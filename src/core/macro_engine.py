@@ -3,10 +3,74 @@
 """
 
 import time
-from typing import Dict, List, Optional
+import ctypes
+import queue
+import threading
+from array import array
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
 from loguru import logger
 import keyboard
 
+from src.utils.send_input import make_key_inputs, make_input_array, send_input, send_inputs
+from src.utils.logger import is_level_enabled
+
+
+# ID слотов оружия (индексы в массивах патронов, 0 не используется)
+WEAPON_IDS = range(1, 7)
+
+# Пути клавиш слотов в конфиге (индекс = ID слота)
+_SLOT_KEY_PATHS = (None,) + tuple(f'keybindings.weapon_slot_{weapon_id}' for weapon_id in WEAPON_IDS)
+
+# Окно подавления повторного выстрела из того же оружия (нс)
+SHOT_DEBOUNCE_NS = 15_000_000
+
+THREAD_PRIORITY_ABOVE_NORMAL = 1
+
+try:
+    _kernel32 = ctypes.WinDLL('kernel32')
+except (AttributeError, OSError):
+    _kernel32 = None
+
+
+# Правило свапа с разобранными полями (вместо dict.get на каждый выстрел)
+ResolvedRule = namedtuple('ResolvedRule', [
+    'to', 'check_ammo', 'quick_switch', 'fallback_to', 'fallback_quick_switch', 'repeat_count'
+])
+
+
+def _resolve_rule(rule: dict) -> ResolvedRule:
+    """Разобрать правило из конфига с дефолтами"""
+    return ResolvedRule(
+        to=rule['to'],
+        check_ammo=rule.get('check_ammo', True),
+        quick_switch=rule.get('quick_switch', False),
+        fallback_to=rule.get('fallback_to', 0),  # 0 = нет fallback
+        fallback_quick_switch=rule.get('fallback_quick_switch', False),
+        repeat_count=rule.get('repeat_count', 1),
+    )
+
+
+def _keyboard_hotkey(key: str):
+    """
+    Скан-код клавиши для keyboard.send (чтобы библиотека не разбирала имя на каждый вызов)
+    
+    Args:
+        key: Имя клавиши
+        
+    Returns:
+        Скан-код или само имя, если библиотека его не знает
+    """
+    try:
+        return keyboard.key_to_scan_codes(key)[0]
+    except (ValueError, IndexError):
+        return key
+
+
+def _new_slot_array() -> array:
+    """Массив int32 на 7 элементов (индекс = ID слота)"""
+    return array('i', bytes(4 * 7))
+
 
 class MacroEngine:
     """Движок макросов для автоматического свапа оружий"""
@@ -23,19 +87,60 @@ class MacroEngine:
         self.current_preset = None
         self.presets = {}
         
-        # Кэш патронов для отслеживания выстрелов
-        self.last_ammo = {}
+        # Переходы состояния (GUI) атомарны относительно друг друга;
+        # поток макросов читает состояние без блокировки, один раз в локальные
+        self._state_lock = threading.Lock()
+        
+        # Кэш патронов для отслеживания выстрелов (массивы по ID слота)
+        self.last_clip = _new_slot_array()
+        self.last_reserve = _new_slot_array()
+        self._has_last = False  # Есть ли предыдущий снимок для сравнения
         self.last_weapon_id = 1
         
-        # Счётчики повторений для чередования правил
-        # Формат: {weapon_id: {'current_rule_idx': 0, 'counter': 0}}
-        self.rule_rotation = {}
+        # Время последнего засчитанного выстрела по ID слота (perf_counter_ns)
+        self._last_shot_ns = array('q', bytes(8 * 7))
+        self._shot_debounce_ns = SHOT_DEBOUNCE_NS
+        
+        # Чередование правил по ID слота 'from':
+        # индекс текущего правила и счётчик его повторений
+        self._rot_idx = _new_slot_array()
+        self._rot_ctr = _new_slot_array()
+        
+        # Правила активного пресета, сгруппированные по оружию 'from'
+        # Формат: {from_weapon: [ResolvedRule, ...]}
+        self._rules_by_from = {}
+        
+        # Пишет ли логгер INFO/DEBUG (не собираем строки свапа впустую)
+        self._log_info_enabled = is_level_enabled("INFO")
+        self._log_debug_enabled = is_level_enabled("DEBUG")
+        
+        # Настройки свапа из конфига (не читаем конфиг на каждый свап)
+        self._knife_slot = None
+        self._qs_delay_ns = 0
+        self._qs_delay_s = 0.0
+        self._weapon_keys = [None] * 7  # Клавиша по ID слота
+        self._key_inputs = [None] * 7   # Предсобранные INPUT (нажатие, отпускание) по ID слота
+        self._fallback_keys = [None] * 7  # Скан-коды для keyboard.send, где нет INPUT
+        self._qs_batches = {}           # (нож, цель) -> массив INPUT для quick switch без задержки
+        self._refresh_config_cache()
+        self.config.add_change_listener(self._on_config_changed)
+        
+        # Свой поток для update(): quick switch спит на ноже и не должен
+        # блокировать основной цикл. Очередь на 1 элемент - устаревший
+        # снимок патронов заменяется свежим
+        self._queue = queue.Queue(maxsize=1)
+        self._pushed_version = -1  # Версия последнего переданного снимка
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
         
         logger.info("MacroEngine инициализирован")
     
     def load_presets(self):
         """Загрузить пресеты из конфига"""
-        self.presets = self.config.get('macros.presets', {})
+        with self._state_lock:
+            self.presets = self.config.get('macros.presets', {})
+            self._refresh_config_cache()
+            self._rebuild_rule_index()
         logger.info(f"Загружено {len(self.presets)} пресетов")
     
     def set_active_preset(self, preset_name: str):
@@ -46,13 +151,54 @@ class MacroEngine:
             preset_name: Название пресета
         """
         if preset_name in self.presets:
-            self.current_preset = preset_name
-            # Сбросить счётчики при смене пресета
-            self.rule_rotation = {}
+            with self._state_lock:
+                self.current_preset = preset_name
+                # Сбросить счётчики при смене пресета
+                self._reset_rotation()
+                self._rebuild_rule_index()
             logger.info(f"Активный пресет: {preset_name}")
         else:
             logger.warning(f"Пресет '{preset_name}' не найден")
     
+    def _refresh_config_cache(self):
+        """Перечитать из конфига нож, задержку quick switch и клавиши слотов"""
+        # (дефолтные значения берутся из default_config.yaml)
+        self._knife_slot = self.config.get('macros.knife_slot')
+        delay_ms = self.config.get('macros.quick_switch_delay')
+        self._qs_delay_ns = int((delay_ms or 0) * 1_000_000)
+        self._qs_delay_s = self._qs_delay_ns / 1e9  # Для time.sleep, считается один раз
+        self._weapon_keys = [None] + [
+            self.config.get(_SLOT_KEY_PATHS[weapon_id], str(weapon_id))
+            for weapon_id in WEAPON_IDS
+        ]
+        # SendInput по скан-коду; None - клавиша не распознана, остаётся keyboard
+        self._key_inputs = [None] + [make_key_inputs(key) for key in self._weapon_keys[1:]]
+        self._fallback_keys = [None] + [
+            _keyboard_hotkey(key) if inputs is None else None
+            for key, inputs in zip(self._weapon_keys[1:], self._key_inputs[1:])
+        ]
+        self._qs_batches = {}
+    
+    def _on_config_changed(self, key_path: Optional[str]):
+        """Подписчик ConfigManager: обновить кэш настроек свапа"""
+        if key_path is None or key_path.startswith(('macros.', 'keybindings.')):
+            with self._state_lock:
+                self._refresh_config_cache()
+    
+    def _reset_rotation(self):
+        """Сбросить чередование правил для всех слотов"""
+        for weapon_id in range(7):
+            self._rot_idx[weapon_id] = 0
+            self._rot_ctr[weapon_id] = 0
+    
+    def _rebuild_rule_index(self):
+        """Сгруппировать правила активного пресета по оружию 'from' (один раз, не на каждый выстрел)"""
+        rules_by_from = {}
+        if self.current_preset in self.presets:
+            for rule in self.presets[self.current_preset].get('rules', []):
+                rules_by_from.setdefault(rule['from'], []).append(_resolve_rule(rule))
+        self._rules_by_from = rules_by_from
+    
     def enable(self):
         """Включить макросы"""
         if not self.current_preset:
@@ -63,81 +209,181 @@ class MacroEngine:
             logger.warning("В пресете нет правил!")
             return False
         
-        self.enabled = True
+        with self._state_lock:
+            # Правила могли измениться в конфиге с момента выбора пресета
+            self._rebuild_rule_index()
+            self._log_info_enabled = is_level_enabled("INFO")
+            self._log_debug_enabled = is_level_enabled("DEBUG")
+            self.enabled = True
         logger.info("Макросы включены")
         return True
     
     def disable(self):
         """Выключить макросы"""
-        self.enabled = False
+        with self._state_lock:
+            self.enabled = False
         logger.info("Макросы выключены")
     
-    def update(self, ammo_data: Dict[int, tuple], current_weapon: Optional[int] = None):
+    def update(self, clip: array, reserve: array, current_weapon: Optional[int] = None):
         """
         Обновление состояния - проверка выстрелов и свап
         
         Args:
-            ammo_data: Данные о патронах {weapon_id: (clip, reserve)}
+            clip: Патроны в обойме по ID слота (array 'i' из 7 элементов)
+            reserve: Запасные патроны по ID слота (array 'i' из 7 элементов)
             current_weapon: ID текущего оружия (опционально)
         """
         if not self.enabled or not self.current_preset:
             return
         
-        # Определяем текущее оружие
+        # Патроны не изменились - выстрела не было, сканировать нечего
+        if self._has_last and clip == self.last_clip:
+            if current_weapon is not None:
+                self.last_weapon_id = current_weapon
+            return
+        
+        # Определяем текущее оружие и был ли выстрел
         if current_weapon is None:
-            # Если не передано, пытаемся определить по изменению патронов
-            current_weapon = self._detect_current_weapon(ammo_data)
+            # Если не передано - один проход по слотам: оружие определяется по выстрелу
+            current_weapon, shot_fired = self._detect_shot(clip)
+        else:
+            shot_fired = self._was_shot_fired(current_weapon, clip)
         
         if current_weapon is None:
             return
         
-        # Проверяем был ли выстрел
-        if self._was_shot_fired(current_weapon, ammo_data):
-            logger.debug(f"Выстрел из оружия {current_weapon}")
+        if shot_fired:
+            if self._log_debug_enabled:
+                logger.debug(f"Выстрел из оружия {current_weapon}")
             self._handle_shot(current_weapon)
         
-        # Обновляем кэш
-        self.last_ammo = ammo_data.copy()
+        # Обновляем кэш (на месте, без новых объектов)
+        self.last_clip[:] = clip
+        self.last_reserve[:] = reserve
+        self._has_last = True
         self.last_weapon_id = current_weapon
     
-    def _detect_current_weapon(self, ammo_data: Dict[int, tuple]) -> Optional[int]:
+    def push_ammo(self, clip: array, reserve: array, current_weapon: Optional[int] = None,
+                  version: Optional[int] = None):
         """
-        Определить текущее оружие по изменению патронов
+        Передать снимок патронов в поток макросов (не блокирует)
         
         Args:
-            ammo_data: Данные о патронах
+            clip: Патроны в обойме по ID слота
+            reserve: Запасные патроны по ID слота
+            current_weapon: ID текущего оружия (опционально)
+            version: Версия снимка у источника (тот же снимок повторно не передаётся)
+        """
+        if not self.enabled:
+            return
+        
+        if version is not None and current_weapon is None:
+            if version == self._pushed_version:
+                return
+            self._pushed_version = version
+        
+        # Копии: источник перезаписывает массивы на месте каждый тик
+        item = (array('i', clip), array('i', reserve), current_weapon)
+        try:
+            self._queue.get_nowait()  # Необработанный снимок устарел
+        except queue.Empty:
+            pass
+        self._queue.put_nowait(item)
+    
+    def _run(self):
+        """Поток макросов: обрабатывает последний снимок патронов"""
+        if _kernel32:
+            _kernel32.SetThreadPriority(_kernel32.GetCurrentThread(), THREAD_PRIORITY_ABOVE_NORMAL)
+        
+        while True:
+            clip, reserve, current_weapon = self._queue.get()
+            try:
+                self.update(clip, reserve, current_weapon)
+            except Exception as e:
+                logger.error(f"Ошибка в потоке макросов: {e}")
+    
+    def update_dict(self, ammo_data: Dict[int, tuple], current_weapon: Optional[int] = None):
+        """
+        Обновление по словарю патронов (совместимость со старым форматом)
+        
+        Args:
+            ammo_data: Данные о патронах {weapon_id: (clip, reserve)}
+            current_weapon: ID текущего оружия (опционально)
+        """
+        if not ammo_data:
+            # Нет данных - следующий снимок не с чем сравнивать
+            self.reset_ammo()
+            return
+        
+        clip = _new_slot_array()
+        reserve = _new_slot_array()
+        for weapon_id, (weapon_clip, weapon_reserve) in ammo_data.items():
+            if 1 <= weapon_id <= 6:
+                clip[weapon_id] = weapon_clip
+                reserve[weapon_id] = weapon_reserve
+        self.update(clip, reserve, current_weapon)
+    
+    def reset_ammo(self):
+        """Сбросить кэш патронов (например, после неудачного чтения памяти)"""
+        self._has_last = False
+        self._pushed_version = -1
+    
+    def _detect_shot(self, clip: array) -> Tuple[Optional[int], bool]:
+        """
+        Определить текущее оружие по изменению патронов и был ли выстрел
+        
+        Args:
+            clip: Патроны в обойме по ID слота
             
         Returns:
-            ID оружия или None
+            Tuple(ID оружия или None, был ли выстрел)
         """
-        # Проверяем у какого оружия изменилась обойма
-        for weapon_id, (clip, reserve) in ammo_data.items():
-            if weapon_id in self.last_ammo:
-                old_clip, old_reserve = self.last_ammo[weapon_id]
-                if clip < old_clip:  # Уменьшилась обойма = стреляли
-                    return weapon_id
-        
-        return self.last_weapon_id
+        if self._has_last:
+            # Проверяем у какого оружия изменилась обойма
+            last_clip = self.last_clip
+            for weapon_id in WEAPON_IDS:
+                if clip[weapon_id] < last_clip[weapon_id]:  # Уменьшилась обойма = стреляли
+                    return weapon_id, self._accept_shot(weapon_id)
+        
+        return self.last_weapon_id, False
     
-    def _was_shot_fired(self, weapon_id: int, ammo_data: Dict[int, tuple]) -> bool:
+    def _was_shot_fired(self, weapon_id: int, clip: array) -> bool:
         """
         Проверить был ли выстрел
         
         Args:
             weapon_id: ID оружия
-            ammo_data: Данные о патронах
+            clip: Патроны в обойме по ID слота
             
         Returns:
             True если был выстрел
         """
-        if weapon_id not in ammo_data or weapon_id not in self.last_ammo:
+        if not self._has_last or not 1 <= weapon_id <= 6:
             return False
         
-        current_clip, _ = ammo_data[weapon_id]
-        old_clip, _ = self.last_ammo[weapon_id]
-        
         # Выстрел = уменьшилась обойма
-        return current_clip < old_clip
+        if clip[weapon_id] >= self.last_clip[weapon_id]:
+            return False
+        
+        return self._accept_shot(weapon_id)
+    
+    def _accept_shot(self, weapon_id: int) -> bool:
+        """
+        Засчитать выстрел с учётом дребезга
+        
+        Args:
+            weapon_id: ID оружия
+            
+        Returns:
+            False если это повтор внутри окна дребезга
+        """
+        # Первый выстрел проходит сразу, повтор внутри окна - дребезг
+        now = time.perf_counter_ns()
+        last = self._last_shot_ns[weapon_id]
+        if last and now - last < self._shot_debounce_ns:
+            return False
+        self._last_shot_ns[weapon_id] = now
+        return True
     
     def _handle_shot(self, from_weapon: int):
         """
@@ -146,74 +392,69 @@ class MacroEngine:
         Args:
             from_weapon: ID оружия из которого стреляли
         """
-        if not self.current_preset or self.current_preset not in self.presets:
-            return
-        
-        # Получаем правила текущего пресета
-        rules = self.presets[self.current_preset].get('rules', [])
-        
-        # Фильтруем правила для текущего оружия
-        matching_rules = [rule for rule in rules if rule['from'] == from_weapon]
+        # Правила для текущего оружия (индекс строится при загрузке/смене пресета)
+        matching_rules = self._rules_by_from.get(from_weapon)
         
         if not matching_rules:
             return
         
-        # Инициализация счётчика для оружия если нужно
-        if from_weapon not in self.rule_rotation:
-            self.rule_rotation[from_weapon] = {
-                'current_rule_idx': 0,
-                'counter': 0
-            }
+        rules_count = len(matching_rules)
         
-        rotation = self.rule_rotation[from_weapon]
-        
-        # Получаем текущее правило для чередования
-        current_rule = matching_rules[rotation['current_rule_idx']]
-        to_weapon = current_rule['to']
-        check_ammo = current_rule.get('check_ammo', True)
-        quick_switch = current_rule.get('quick_switch', False)
-        fallback_to = current_rule.get('fallback_to', 0)  # 0 = нет fallback
-        fallback_quick_switch = current_rule.get('fallback_quick_switch', False)
-        repeat_count = current_rule.get('repeat_count', 1)
+        # Текущее правило для чередования (индекс мог устареть после правки правил)
+        rule_idx = self._rot_idx[from_weapon]
+        if rule_idx >= rules_count:
+            rule_idx = 0
+            self._rot_ctr[from_weapon] = 0
+        rule = matching_rules[rule_idx]
+        to_weapon = rule.to
+        quick_switch = rule.quick_switch
         
         # Флаг: используется ли fallback
         using_fallback = False
         
         # Проверяем патроны если нужно
-        if check_ammo and not self._has_ammo(to_weapon):
+        if rule.check_ammo and not self._has_ammo(to_weapon):
             # Если есть fallback оружие - используем его
-            if fallback_to > 0:
-                logger.info(f"У оружия {to_weapon} нет патронов → fallback на {fallback_to}")
-                to_weapon = fallback_to
-                quick_switch = fallback_quick_switch  # Используем настройку QS для fallback!
+            if rule.fallback_to > 0:
+                if self._log_info_enabled:
+                    logger.info(f"У оружия {to_weapon} нет патронов → fallback на {rule.fallback_to}")
+                to_weapon = rule.fallback_to
+                quick_switch = rule.fallback_quick_switch  # Используем настройку QS для fallback!
                 using_fallback = True
                 
                 # Для fallback тоже проверяем патроны
                 if not self._has_ammo(to_weapon):
-                    logger.debug(f"Свап отменён: у fallback оружия {to_weapon} тоже нет патронов")
-                    rotation['counter'] = 0
-                    rotation['current_rule_idx'] = (rotation['current_rule_idx'] + 1) % len(matching_rules)
+                    if self._log_debug_enabled:
+                        logger.debug(f"Свап отменён: у fallback оружия {to_weapon} тоже нет патронов")
+                    self._rot_ctr[from_weapon] = 0
+                    self._rot_idx[from_weapon] = (rule_idx + 1) % rules_count
                     return
             else:
                 # Нет fallback - пропускаем правило
-                logger.debug(f"Свап отменён: у оружия {to_weapon} нет патронов (fallback не задан)")
-                rotation['counter'] = 0
-                rotation['current_rule_idx'] = (rotation['current_rule_idx'] + 1) % len(matching_rules)
+                if self._log_debug_enabled:
+                    logger.debug(f"Свап отменён: у оружия {to_weapon} нет патронов (fallback не задан)")
+                self._rot_ctr[from_weapon] = 0
+                self._rot_idx[from_weapon] = (rule_idx + 1) % rules_count
                 return
         
+        counter = self._rot_ctr[from_weapon]
+        
         # Выполняем свап
-        qs_marker = "🔪" if quick_switch else ""
-        fallback_marker = " [FALLBACK]" if using_fallback else ""
-        logger.info(f"Свап: {from_weapon} → {to_weapon} {qs_marker}{fallback_marker}(правило {rotation['current_rule_idx'] + 1}/{len(matching_rules)}, выстрел {rotation['counter'] + 1}/{repeat_count})")
+        if self._log_info_enabled:
+            qs_marker = "🔪" if quick_switch else ""
+            fallback_marker = " [FALLBACK]" if using_fallback else ""
+            logger.info(f"Свап: {from_weapon} → {to_weapon} {qs_marker}{fallback_marker}(правило {rule_idx + 1}/{rules_count}, выстрел {counter + 1}/{rule.repeat_count})")
         self._switch_weapon(to_weapon, use_quick_switch=quick_switch)
         
         # Увеличиваем счётчик
-        rotation['counter'] += 1
+        counter += 1
         
         # Если достигли лимита повторений, переключаемся на следующее правило
-        if rotation['counter'] >= repeat_count:
-            rotation['counter'] = 0
-            rotation['current_rule_idx'] = (rotation['current_rule_idx'] + 1) % len(matching_rules)
+        if counter >= rule.repeat_count:
+            self._rot_ctr[from_weapon] = 0
+            self._rot_idx[from_weapon] = (rule_idx + 1) % rules_count
+        else:
+            self._rot_ctr[from_weapon] = counter
     
     def _has_ammo(self, weapon_id: int) -> bool:
         """
@@ -225,24 +466,11 @@ class MacroEngine:
         Returns:
             True если есть патроны в обойме
         """
-        if weapon_id not in self.last_ammo:
+        if not self._has_last or not 1 <= weapon_id <= 6:
             return False
         
-        clip, reserve = self.last_ammo[weapon_id]
         # Проверяем ТОЛЬКО обойму (не запас!)
-        return clip > 0
-    
-    def _get_weapon_key(self, weapon_id: int) -> str:
-        """
-        Получить клавишу для слота оружия из конфига
-        
-        Args:
-            weapon_id: ID оружия (1-6)
-            
-        Returns:
-            Клавиша для переключения на это оружие
-        """
-        return self.config.get(f'keybindings.weapon_slot_{weapon_id}', str(weapon_id))
+        return self.last_clip[weapon_id] > 0
     
     def _switch_weapon(self, weapon_id: int, use_quick_switch: bool = False):
         """
@@ -257,30 +485,79 @@ class MacroEngine:
             return
         
         try:
-            # Читаем глобальные настройки quick switch из конфига
-            # (дефолтные значения берутся из default_config.yaml)
-            knife_slot = self.config.get('macros.knife_slot')
-            delay_ms = self.config.get('macros.quick_switch_delay')
+            # Глобальные настройки quick switch (кэш из конфига, один раз в локальные)
+            knife_slot = self._knife_slot
+            weapon_keys = self._weapon_keys
             
             # Quick Switch: нож → целевое оружие (только если включено для этого правила)
             if use_quick_switch and weapon_id != knife_slot:
                 # Шаг 1: Переключаемся на нож
-                knife_key = self._get_weapon_key(knife_slot)
+                knife_key = weapon_keys[knife_slot] if knife_slot in WEAPON_IDS else None
                 if knife_key:
-                    keyboard.send(knife_key)
-                    logger.debug(f"🔪 Quick switch: нож ({knife_slot})")
+                    # Без задержки - нож и цель одним SendInput из 4 событий
+                    if self._qs_delay_ns <= 0 and self._send_qs_batch(knife_slot, weapon_id):
+                        if self._log_debug_enabled:
+                            logger.debug(f"🔪 Quick switch: нож ({knife_slot}) + {weapon_keys[weapon_id]} одним вызовом")
+                        return
+                    
+                    self._press_slot(knife_slot)
+                    if self._log_debug_enabled:
+                        logger.debug(f"🔪 Quick switch: нож ({knife_slot})")
                     
                     # Задержка на ноже (отменяет анимацию)
-                    time.sleep(delay_ms / 1000.0)
+                    time.sleep(self._qs_delay_s)
             
             # Шаг 2: Переключаемся на целевое оружие
-            key = self._get_weapon_key(weapon_id)
-            keyboard.send(key)
-            logger.debug(f"Нажата клавиша: {key}")
+            key = weapon_keys[weapon_id]
+            self._press_slot(weapon_id)
+            if self._log_debug_enabled:
+                logger.debug(f"Нажата клавиша: {key}")
             
         except Exception as e:
             logger.error(f"Ошибка переключения оружия: {e}")
     
+    def _send_qs_batch(self, knife_slot: int, weapon_id: int) -> bool:
+        """
+        Отправить нож и целевое оружие одним вызовом SendInput
+        
+        События идут подряд в одном пакете, поэтому игра должна ловить
+        нажатия клавиш как события, а не опрашивать их состояние.
+        
+        Args:
+            knife_slot: Слот ножа
+            weapon_id: Целевой слот
+            
+        Returns:
+            True если отправлено (False - клавиши без скан-кода, нужен обычный путь)
+        """
+        pair = (knife_slot, weapon_id)
+        batches = self._qs_batches
+        batch = batches.get(pair)
+        if batch is None:
+            knife_inputs = self._key_inputs[knife_slot]
+            target_inputs = self._key_inputs[weapon_id]
+            if knife_inputs is None or target_inputs is None:
+                return False
+            batch = make_input_array(*knife_inputs, *target_inputs)
+            batches[pair] = batch
+        
+        send_inputs(batch)
+        return True
+    
+    def _press_slot(self, weapon_id: int):
+        """
+        Нажать и отпустить клавишу слота
+        
+        Args:
+            weapon_id: ID оружия (1-6)
+        """
+        inputs = self._key_inputs[weapon_id]
+        if inputs is not None:
+            send_input(inputs[0])
+            send_input(inputs[1])
+        else:
+            keyboard.send(self._fallback_keys[weapon_id])
+    
     def get_status(self) -> str:
         """Получить статус макросов"""
         if not self.enabled:
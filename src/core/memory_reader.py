@@ -4,7 +4,11 @@
 """
 
 import time
+import ctypes
 import struct
+import threading
+from array import array
+from ctypes import wintypes
 from typing import Optional, Dict, List, Tuple
 from loguru import logger
 
@@ -17,6 +21,105 @@ except ImportError:
     logger.warning("pymem не установлен. Установите: pip install pymem")
 
 
+# Формат int32 (little-endian) для разбора блока слотов
+_INT32 = struct.Struct('<i')
+# Цвет UISprite.mColor: 4 float подряд (R, G, B, A)
+_RGBA = struct.Struct('<4f')
+# Битовые образы IEEE-754 float32: 0.5 и 1.0. Для неотрицательных float порядок
+# их битов как uint32 совпадает с порядком значений, поэтому канал цвета (0..1)
+# сравнивается как целое число без распаковки float
+F32_HALF_BITS = 0x3F000000
+F32_ONE_BITS = 0x3F800000
+
+# Отладочные логи горячих чтений (по адресу/шагу цепочки, ошибки опроса прицела):
+# выключены, чтобы не форматировать строки десятки раз за тик
+_LOG_HOT = False
+
+# Время жизни закэшированного адреса таблицы слотов (конец pointer chain)
+SLOTS_BASE_TTL_S = 0.5
+# Время жизни предсказанного адреса Green канала прицела (конец цепочки прицела)
+CROSSHAIR_TAIL_TTL_S = 0.5
+# Период опроса прицела фоновым монитором (сек)
+TARGET_MONITOR_INTERVAL_S = 0.008
+# Правдоподобный диапазон патронов: за его пределами адрес считаем устаревшим
+AMMO_SANE_MAX = 9999
+
+# Прямой ReadProcessMemory: без промежуточных буферов и struct.unpack внутри pymem
+try:
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _ReadProcessMemory = _kernel32.ReadProcessMemory
+    _ReadProcessMemory.argtypes = (wintypes.HANDLE, wintypes.LPCVOID, wintypes.LPVOID,
+                                   ctypes.c_size_t, ctypes.POINTER(ctypes.c_size_t))
+    _ReadProcessMemory.restype = wintypes.BOOL
+    RPM_AVAILABLE = True
+except (AttributeError, OSError):
+    _ReadProcessMemory = None
+    RPM_AVAILABLE = False
+
+
+class _SYSTEM_INFO(ctypes.Structure):
+    _fields_ = [
+        ('wProcessorArchitecture', wintypes.WORD),
+        ('wReserved', wintypes.WORD),
+        ('dwPageSize', wintypes.DWORD),
+        ('lpMinimumApplicationAddress', ctypes.c_void_p),
+        ('lpMaximumApplicationAddress', ctypes.c_void_p),
+        ('dwActiveProcessorMask', ctypes.c_size_t),
+        ('dwNumberOfProcessors', wintypes.DWORD),
+        ('dwProcessorType', wintypes.DWORD),
+        ('dwAllocationGranularity', wintypes.DWORD),
+        ('wProcessorLevel', wintypes.WORD),
+        ('wProcessorRevision', wintypes.WORD),
+    ]
+
+
+def _user_address_range() -> Tuple[int, int]:
+    """
+    Границы пользовательского адресного пространства (GetSystemInfo)
+    
+    Указатель вне них заведомо мусорный - такой шаг цепочки отбрасываем без чтения
+    """
+    lo, hi = 0x10000, 0x7FFFFFFEFFFF  # Значения x64 Windows по умолчанию
+    if RPM_AVAILABLE:
+        info = _SYSTEM_INFO()
+        _kernel32.GetSystemInfo(ctypes.byref(info))
+        lo = info.lpMinimumApplicationAddress or lo
+        hi = info.lpMaximumApplicationAddress or hi
+    return lo, hi
+
+
+USER_ADDR_MIN, USER_ADDR_MAX = _user_address_range()
+
+
+def _make_slot_table_type(stride: int, clip_off: int, reserve_off: int):
+    """
+    ctypes-тип таблицы из 6 слотов (clip/reserve - int32 по своим оффсетам внутри слота)
+    
+    Returns:
+        Тип массива (SlotT * 6) или None, если поля не помещаются в слот
+    """
+    fields = []
+    pos = 0
+    for off, name in sorted(((clip_off, 'clip'), (reserve_off, 'reserve'))):
+        if off < pos:
+            return None
+        if off > pos:
+            fields.append((f'_pad_{pos:x}', ctypes.c_ubyte * (off - pos)))
+        fields.append((name, ctypes.c_int32))
+        pos = off + 4
+    
+    if stride < pos:
+        return None
+    if stride > pos:
+        fields.append(('_pad_end', ctypes.c_ubyte * (stride - pos)))
+    
+    class SlotT(ctypes.Structure):
+        _pack_ = 1
+        _fields_ = fields
+    
+    return SlotT * 6
+
+
 class MemoryReader:
     """
     Класс для чтения памяти игры Pixel Gun 3D
@@ -27,6 +130,9 @@ class MemoryReader:
     - Здоровье, броня (опционально)
     """
     
+    # Читатели, которые после connect() подменяются прямыми _read_*_fast
+    _FAST_READERS = ('read_int32', 'read_float', 'read_pointer', 'read_byte', 'read_bytes')
+    
     def __init__(self, process_name: str = "PixelGun3D.exe"):
         """
         Инициализация memory reader
@@ -55,8 +161,49 @@ class MemoryReader:
             'crosshair_offsets': []        # Цепочка указателей к AimCrosshairController
         }
         
+        # Хэндл процесса для прямого ReadProcessMemory и переиспользуемые буферы
+        self._handle = None
+        self._buf_i32 = ctypes.c_int32()
+        self._buf_u64 = ctypes.c_uint64()
+        self._buf_f32 = ctypes.c_float()
+        self._buf_u32 = ctypes.c_uint32()
+        self._block_bufs = {}  # size -> буфер для read_bytes (размеры блоков постоянные)
+        self._buf_u8 = ctypes.c_ubyte()
+        # Сколько байт реально прочитано: частичное чтение считаем ошибкой без исключений
+        self._nread = ctypes.c_size_t()
+        self._nread_ref = ctypes.byref(self._nread)
+        
+        # Раскладка таблицы слотов: ((clip_off, reserve_off), ...) и размер блока
+        self._slot_layout = None
+        self._slots_span = 0
+        self._slot_table = None  # Экземпляр (SlotT * 6) - ReadProcessMemory пишет прямо в него
+        
+        # Абсолютные адреса и цепочки оффсетов (пересчитываются в set_offsets/connect)
+        self._abs_active_weapon = None
+        self._abs_chain_root = None
+        self._abs_crosshair_root = None
+        self._chain_offsets = ()
+        self._crosshair_offsets = ()
+        
+        # Предсказанный конец цепочки прицела с прошлого прохода:
+        # (адрес последнего указателя, его значение, адрес Green канала) - одним кортежем,
+        # чтобы монитор и основной поток не видели его наполовину обновлённым
+        self._crosshair_tail = None
+        self._crosshair_tail_expiry = 0.0
+        
+        # Кэш конца pointer chain: объект слотов в куче Unity почти никогда не переезжает
+        self._slots_base_cache = None
+        self._slots_base_expiry = 0.0
+        self._chain_ok = True  # Был ли последний проход по цепочке успешным (для лога обрыва)
+        
         # Кэш данных
         self.ammo_cache = {}
+        self.ammo_block = b''  # Сырой блок памяти слотов с последнего чтения
+        self.ammo_version = 0  # Растёт при каждом изменении блока слотов
+        # Патроны последнего чтения массивами по ID слота (индекс 0 не используется)
+        self.clip_ammo = array('i', bytes(4 * 7))
+        self.reserve_ammo = array('i', bytes(4 * 7))
+        self.active_weapon = None  # ID активного оружия последнего read_all_ammo(with_active_weapon=True)
         self.active_weapon_cache = 1
         self.last_update = 0
         
@@ -64,6 +211,12 @@ class MemoryReader:
         self.last_target_state = None  # True/False/None
         self.last_target_ptr = None
         
+        # Фоновый монитор прицела: публикует переходы "мимо" <-> "на враге"
+        self.target_on_enemy = False
+        self.target_event = threading.Event()  # Взводится при каждой смене состояния
+        self._target_stop = threading.Event()
+        self._target_thread = None
+        
         logger.info("MemoryReader инициализирован")
     
     def connect(self) -> bool:
@@ -79,6 +232,8 @@ class MemoryReader:
                 self.pm.process_handle,
                 self.process_name
             ).lpBaseOfDll
+            self._handle = self.pm.process_handle if RPM_AVAILABLE else None
+            self._bind_readers()
             
             # Ищем GameAssembly.dll (Unity)
             try:
@@ -92,6 +247,9 @@ class MemoryReader:
                 self.module_base = self.base_address
                 logger.warning(f"⚠️ GameAssembly.dll не найден, используем базовый адрес")
             
+            self._resolve_addresses()
+            self.invalidate_slots_base()
+            
             logger.info(f"✅ Подключено к {self.process_name}")
             logger.info(f"Base address: 0x{self.base_address:X}")
             return True
@@ -117,8 +275,81 @@ class MemoryReader:
             offsets: Словарь с оффсетами
         """
         self.offsets.update(offsets)
+        self._build_slot_layout()
+        self._resolve_addresses()
+        self.invalidate_slots_base()
         logger.info(f"Оффсеты установлены: {offsets}")
     
+    def _resolve_addresses(self):
+        """Предрасчёт абсолютных адресов: база модуля + оффсет (инварианты после connect + set_offsets)"""
+        offsets = self.offsets
+        self._chain_offsets = tuple(offsets.get('pointer_offsets') or ())
+        self._crosshair_offsets = tuple(offsets.get('crosshair_offsets') or ())
+        
+        active_weapon = offsets.get('active_weapon')
+        self._abs_active_weapon = (
+            self.base_address + active_weapon
+            if self.base_address is not None and active_weapon is not None else None
+        )
+        
+        slots_base = offsets.get('weapon_slots_base')
+        self._abs_chain_root = (
+            self.module_base + slots_base
+            if self.module_base is not None and slots_base is not None else None
+        )
+        
+        crosshair = offsets.get('crosshair_controller')
+        self._abs_crosshair_root = (
+            self.module_base + crosshair
+            if self.module_base is not None and crosshair is not None else None
+        )
+        self._crosshair_tail = None
+    
+    def _build_slot_layout(self):
+        """Предрасчёт оффсетов clip/reserve всех 6 слотов внутри одного блока памяти"""
+        stride = self.offsets.get('slot_offset')
+        clip_off = self.offsets.get('slot_1_clip')
+        reserve_off = self.offsets.get('slot_1_reserve')
+        
+        if stride is None or clip_off is None or reserve_off is None:
+            self._slot_layout = None
+            self._slots_span = 0
+            self._slot_table = None
+            return
+        
+        self._slot_layout = tuple(
+            (i * stride + clip_off, i * stride + reserve_off)
+            for i in range(6)
+        )
+        self._slots_span = 5 * stride + max(clip_off, reserve_off) + 4
+        
+        table_type = _make_slot_table_type(stride, clip_off, reserve_off)
+        self._slot_table = table_type() if table_type is not None else None
+    
+    def invalidate_slots_base(self):
+        """Сбросить закэшированный адрес таблицы слотов (следующее чтение пройдёт pointer chain)"""
+        self._slots_base_cache = None
+        self._slots_base_expiry = 0.0
+    
+    def _get_slots_base(self, now: float) -> Optional[int]:
+        """
+        Адрес таблицы слотов: из кэша, пока не истёк TTL, иначе проход по pointer chain
+        
+        Args:
+            now: Текущее time.monotonic()
+        """
+        if self._slots_base_cache is not None and now < self._slots_base_expiry:
+            return self._slots_base_cache
+        
+        slots_base = self.follow_pointer_chain()
+        if slots_base is None:
+            self.invalidate_slots_base()
+            return None
+        
+        self._slots_base_cache = slots_base
+        self._slots_base_expiry = now + SLOTS_BASE_TTL_S
+        return slots_base
+    
     def read_int32(self, address: int) -> Optional[int]:
         """
         Чтение 32-битного целого числа
@@ -135,7 +366,8 @@ class MemoryReader:
         try:
             return self.pm.read_int(address)
         except Exception as e:
-            logger.debug(f"Ошибка чтения адреса 0x{address:X}: {e}")
+            if _LOG_HOT:
+                logger.debug(f"Ошибка чтения адреса 0x{address:X}: {e}")
             return None
     
     def read_float(self, address: int) -> Optional[float]:
@@ -154,7 +386,8 @@ class MemoryReader:
         try:
             return self.pm.read_float(address)
         except Exception as e:
-            logger.debug(f"Ошибка чтения float адреса 0x{address:X}: {e}")
+            if _LOG_HOT:
+                logger.debug(f"Ошибка чтения float адреса 0x{address:X}: {e}")
             return None
     
     def read_pointer(self, address: int) -> Optional[int]:
@@ -173,7 +406,8 @@ class MemoryReader:
         try:
             return self.pm.read_longlong(address)
         except Exception as e:
-            logger.debug(f"Ошибка чтения указателя 0x{address:X}: {e}")
+            if _LOG_HOT:
+                logger.debug(f"Ошибка чтения указателя 0x{address:X}: {e}")
             return None
     
     def read_byte(self, address: int) -> Optional[int]:
@@ -192,46 +426,151 @@ class MemoryReader:
         try:
             return self.pm.read_uchar(address)
         except Exception as e:
-            logger.debug(f"Ошибка чтения байта 0x{address:X}: {e}")
+            if _LOG_HOT:
+                logger.debug(f"Ошибка чтения байта 0x{address:X}: {e}")
             return None
     
-    def follow_pointer_chain(self) -> Optional[int]:
+    def read_bytes(self, address: int, size: int) -> Optional[bytes]:
         """
-        Следование по цепочке указателей
+        Чтение блока памяти
         
+        Args:
+            address: Адрес для чтения
+            size: Размер блока в байтах
+            
         Returns:
-            Финальный адрес или None
+            Байты или None при ошибке
         """
         if not self.is_connected():
             return None
         
-        if self.offsets['weapon_slots_base'] is None:
+        try:
+            return self.pm.read_bytes(address, size)
+        except Exception as e:
+            if _LOG_HOT:
+                logger.debug(f"Ошибка чтения блока 0x{address:X} ({size} байт): {e}")
+            return None
+    
+    def _bind_readers(self):
+        """
+        Подмена read_* на прямые версии, пока есть хэндл процесса
+        
+        После connect() методы экземпляра указывают на _read_*_fast без проверок
+        подключения и ветвления на pymem; после disconnect() возвращаются обычные
+        """
+        for name in self._FAST_READERS:
+            if self._handle is not None:
+                setattr(self, name, getattr(self, f'_{name}_fast'))
+            else:
+                self.__dict__.pop(name, None)
+    
+    def _read_int32_fast(self, address: int) -> Optional[int]:
+        """read_int32 через прямой ReadProcessMemory"""
+        buf = self._buf_i32
+        if _ReadProcessMemory(self._handle, address, ctypes.byref(buf), 4, self._nread_ref) and self._nread.value == 4:
+            return buf.value
+        return None
+    
+    def _read_float_fast(self, address: int) -> Optional[float]:
+        """read_float через прямой ReadProcessMemory"""
+        buf = self._buf_f32
+        if _ReadProcessMemory(self._handle, address, ctypes.byref(buf), 4, self._nread_ref) and self._nread.value == 4:
+            return buf.value
+        return None
+    
+    def _read_pointer_fast(self, address: int) -> Optional[int]:
+        """read_pointer через прямой ReadProcessMemory"""
+        buf = self._buf_u64
+        if _ReadProcessMemory(self._handle, address, ctypes.byref(buf), 8, self._nread_ref) and self._nread.value == 8:
+            return buf.value
+        return None
+    
+    def _read_byte_fast(self, address: int) -> Optional[int]:
+        """read_byte через прямой ReadProcessMemory"""
+        buf = self._buf_u8
+        if _ReadProcessMemory(self._handle, address, ctypes.byref(buf), 1, self._nread_ref) and self._nread.value == 1:
+            return buf.value
+        return None
+    
+    def _read_bytes_fast(self, address: int, size: int) -> Optional[bytes]:
+        """read_bytes через прямой ReadProcessMemory"""
+        buf = self._block_bufs.get(size)
+        if buf is None:
+            buf = self._block_bufs[size] = ctypes.create_string_buffer(size)
+        if _ReadProcessMemory(self._handle, address, buf, size, self._nread_ref) and self._nread.value == size:
+            return buf.raw
+        return None
+    
+    def follow_pointer_chain(self) -> Optional[int]:
+        """
+        Следование по цепочке указателей
+        
+        Returns:
+            Финальный адрес или None
+        """
+        # None если не подключены или оффсет не задан
+        address = self._abs_chain_root
+        if address is None or not self.is_connected():
             return None
         
         try:
             # Начинаем с модуля + базовый оффсет
-            address = self.module_base + self.offsets['weapon_slots_base']
-            logger.debug(f"Начало: 0x{address:X}")
+            if _LOG_HOT:
+                logger.debug(f"Начало: 0x{address:X}")
+            
+            handle = self._handle
+            if handle is not None:
+                # Прямой ReadProcessMemory на каждом шаге, без вызова read_pointer
+                buf = self._buf_u64
+                buf_ref = ctypes.byref(buf)
+                nread = self._nread
+                nread_ref = self._nread_ref
+                for i, offset in enumerate(self._chain_offsets):
+                    if not _ReadProcessMemory(handle, address, buf_ref, 8, nread_ref) or nread.value != 8:
+                        self._report_chain_failure(i)
+                        return None
+                    ptr = buf.value
+                    if not USER_ADDR_MIN <= ptr <= USER_ADDR_MAX:
+                        # NULL или мусор (цепочка устарела после загрузки) - следующий шаг не читаем
+                        self._report_chain_failure(i)
+                        return None
+                    address = ptr + offset
+                    if _LOG_HOT:
+                        logger.debug(f"Шаг {i+1}: 0x{address:X} (+0x{offset:X})")
+                
+                if _LOG_HOT:
+                    logger.debug(f"Финал: 0x{address:X}")
+                self._chain_ok = True
+                return address
             
             # Идём по цепочке указателей
-            for i, offset in enumerate(self.offsets.get('pointer_offsets', [])):
+            for i, offset in enumerate(self._chain_offsets):
                 # Читаем указатель
                 address = self.read_pointer(address)
                 if address is None:
-                    logger.error(f"Не удалось прочитать указатель на шаге {i}")
+                    self._report_chain_failure(i)
                     return None
                 
                 # Прибавляем оффсет
                 address += offset
-                logger.debug(f"Шаг {i+1}: 0x{address:X} (+0x{offset:X})")
+                if _LOG_HOT:
+                    logger.debug(f"Шаг {i+1}: 0x{address:X} (+0x{offset:X})")
             
-            logger.debug(f"Финал: 0x{address:X}")
+            if _LOG_HOT:
+                logger.debug(f"Финал: 0x{address:X}")
+            self._chain_ok = True
             return address
         
         except Exception as e:
             logger.error(f"Ошибка pointer chain: {e}")
             return None
     
+    def _report_chain_failure(self, step: int):
+        """Лог обрыва pointer chain - один раз до следующего успешного прохода (меню, загрузка)"""
+        if self._chain_ok:
+            self._chain_ok = False
+            logger.error(f"Не удалось прочитать указатель на шаге {step}")
+    
     def read_slot_ammo(self, slot_id: int) -> Optional[Tuple[int, int]]:
         """
         Чтение патронов для слота
@@ -245,56 +584,156 @@ class MemoryReader:
         if not self.is_connected():
             return None
         
-        if self.offsets['weapon_slots_base'] is None:
+        if self.offsets['weapon_slots_base'] is None or self._slot_layout is None:
             logger.warning("⚠️ Оффсеты не установлены! Используйте set_offsets()")
             return None
         
         try:
-            # Следуем по pointer chain
-            slots_base = self.follow_pointer_chain()
+            # Следуем по pointer chain (или берём адрес из кэша)
+            slots_base = self._get_slots_base(time.monotonic())
             if slots_base is None:
                 logger.error("Не удалось пройти pointer chain")
                 return None
             
-            # Вычисляем адрес слота
-            slot_offset = self.offsets['slot_offset'] * (slot_id - 1)
-            slot_address = slots_base + slot_offset
+            # Оффсеты слота внутри таблицы предрасчитаны в set_offsets
+            clip_rel, reserve_rel = self._slot_layout[slot_id - 1]
             
             # Читаем запас (reserve)
-            reserve_addr = slot_address + self.offsets['slot_1_reserve']
-            reserve = self.read_int32(reserve_addr)
+            reserve = self.read_int32(slots_base + reserve_rel)
             
             # Читаем обойму (clip)
-            clip_addr = slot_address + self.offsets['slot_1_clip']
-            clip = self.read_int32(clip_addr)
+            clip = self.read_int32(slots_base + clip_rel)
             
             if clip is not None and reserve is not None:
-                logger.debug(f"Слот {slot_id}: {clip}/{reserve} (обойма/запас)")
+                if _LOG_HOT:
+                    logger.debug(f"Слот {slot_id}: {clip}/{reserve} (обойма/запас)")
                 return (clip, reserve)
             
+            # Адрес из кэша мог устареть - следующее чтение пройдёт цепочку заново
+            self.invalidate_slots_base()
             return None
         
         except Exception as e:
+            self.invalidate_slots_base()
             logger.error(f"Ошибка чтения слота {slot_id}: {e}")
             return None
     
-    def read_all_ammo(self) -> Dict[int, Tuple[int, int]]:
+    def read_all_ammo(self, with_active_weapon: bool = False) -> Dict[int, Tuple[int, int]]:
         """
         Чтение патронов для всех 6 слотов одновременно
         
+        Args:
+            with_active_weapon: Сразу за таблицей слотов прочитать ID активного
+                оружия (результат в self.active_weapon)
+        
         Returns:
-            Dict {slot_id: (current, max)}
+            Dict {slot_id: (current, max)} - при успехе всегда один и тот же
+            объект (self.ammo_cache), вызывающий код не должен его изменять
         """
         all_ammo = {}
         
-        for slot_id in range(1, 7):
-            ammo = self.read_slot_ammo(slot_id)
-            if ammo:
-                all_ammo[slot_id] = ammo
-                self.ammo_cache[slot_id] = ammo
+        if not self.is_connected():
+            return all_ammo
+        
+        if self.offsets['weapon_slots_base'] is None or self._slot_layout is None:
+            logger.warning("⚠️ Оффсеты не установлены! Используйте set_offsets()")
+            return all_ammo
+        
+        # Pointer chain проходится не чаще раза в SLOTS_BASE_TTL_S,
+        # таблица слотов читается одним блоком вместо 12 отдельных чтений int32
+        now = time.monotonic()
+        cached = self._slots_base_cache is not None and now < self._slots_base_expiry
+        slots_base = self._get_slots_base(now)
+        if slots_base is None:
+            return all_ammo
+        
+        block = self._read_slot_table(slots_base)
+        if cached and (block is None or (block != self.ammo_block and not self._slot1_plausible(block))):
+            # Объект мог переехать - сбрасываем кэш и проходим цепочку заново
+            self.invalidate_slots_base()
+            slots_base = self._get_slots_base(now)
+            if slots_base is None:
+                return all_ammo
+            block = self._read_slot_table(slots_base)
+        
+        if block is None:
+            self.invalidate_slots_base()
+            return all_ammo
+        
+        if with_active_weapon:
+            # Второе чтение идёт подряд с первым, без обёрток read_active_weapon
+            self.active_weapon = self._read_active_weapon_fast()
+        
+        # Блок не изменился - словарь и массивы с прошлого чтения актуальны,
+        # новых кортежей не создаём
+        ammo_cache = self.ammo_cache
+        if block != self.ammo_block or len(ammo_cache) != 6:
+            clip_ammo = self.clip_ammo
+            reserve_ammo = self.reserve_ammo
+            for slot_id, (clip, reserve) in enumerate(self._slot_values(block), 1):
+                clip_ammo[slot_id] = clip
+                reserve_ammo[slot_id] = reserve
+                ammo = ammo_cache.get(slot_id)
+                if ammo is None or ammo[0] != clip or ammo[1] != reserve:
+                    ammo_cache[slot_id] = (clip, reserve)
+            
+            if block != self.ammo_block:
+                self.ammo_version += 1
+            self.ammo_block = block
         
         self.last_update = time.time()
-        return all_ammo
+        return ammo_cache
+    
+    def _read_slot_table(self, slots_base: int) -> Optional[bytes]:
+        """
+        Чтение таблицы слотов одним блоком
+        
+        Returns:
+            Сырой блок или None
+        """
+        table = self._slot_table
+        if table is not None and self._handle is not None:
+            # Таблица слотов читается прямо в ctypes-структуру, без разбора байтов
+            size = ctypes.sizeof(table)
+            if not (_ReadProcessMemory(self._handle, slots_base, ctypes.byref(table), size, self._nread_ref)
+                    and self._nread.value == size):
+                return None
+            return bytes(table)
+        
+        return self.read_bytes(slots_base, self._slots_span)
+    
+    def _slot_values(self, block: bytes) -> List[Tuple[int, int]]:
+        """
+        Разбор блока, только что прочитанного _read_slot_table
+        
+        Returns:
+            [(clip, reserve), ...] для слотов 1-6
+        """
+        table = self._slot_table
+        if table is not None and self._handle is not None:
+            # Блок - копия ctypes-таблицы, поля берём прямо из структуры
+            return [(slot.clip, slot.reserve) for slot in table]
+        
+        return [
+            (_INT32.unpack_from(block, clip_off)[0], _INT32.unpack_from(block, reserve_off)[0])
+            for clip_off, reserve_off in self._slot_layout
+        ]
+    
+    def _slot1_plausible(self, block: bytes) -> bool:
+        """
+        Проверка, что адрес таблицы ещё верный: патроны слота 1 в 0..AMMO_SANE_MAX
+        
+        Цепочка либо верна целиком, либо нет - остальные слоты не проверяем
+        """
+        table = self._slot_table
+        if table is not None and self._handle is not None:
+            clip = table[0].clip
+            reserve = table[0].reserve
+        else:
+            clip_off, reserve_off = self._slot_layout[0]
+            clip = _INT32.unpack_from(block, clip_off)[0]
+            reserve = _INT32.unpack_from(block, reserve_off)[0]
+        return 0 <= clip <= AMMO_SANE_MAX and 0 <= reserve <= AMMO_SANE_MAX
     
     def read_active_weapon(self) -> Optional[int]:
         """
@@ -303,17 +742,15 @@ class MemoryReader:
         Returns:
             ID оружия (1-6) или None
         """
-        if not self.is_connected():
-            return None
-        
-        if self.offsets['active_weapon'] is None:
+        addr = self._abs_active_weapon
+        if addr is None or not self.is_connected():
             return None
         
         try:
-            addr = self.base_address + self.offsets['active_weapon']
             weapon_id = self.read_int32(addr)
             
-            if weapon_id and 1 <= weapon_id <= 6:
+            # (id - 1) как uint32 < 6 - одно сравнение вместо цепочки; 0 и отрицательные дают огромное число
+            if weapon_id is not None and ((weapon_id - 1) & 0xFFFFFFFF) < 6:
                 self.active_weapon_cache = weapon_id
                 return weapon_id
             
@@ -323,6 +760,26 @@ class MemoryReader:
             logger.error(f"Ошибка чтения активного оружия: {e}")
             return None
     
+    def _read_active_weapon_fast(self) -> Optional[int]:
+        """ID активного оружия через прямой ReadProcessMemory (если хэндл есть)"""
+        addr = self._abs_active_weapon
+        if addr is None:
+            return None
+        
+        if self._handle is None:
+            return self.read_active_weapon()
+        
+        buf = self._buf_i32
+        if not (_ReadProcessMemory(self._handle, addr, ctypes.byref(buf), 4, self._nread_ref)
+                and self._nread.value == 4):
+            return None
+        
+        weapon_id = buf.value
+        if ((weapon_id - 1) & 0xFFFFFFFF) < 6:
+            self.active_weapon_cache = weapon_id
+            return weapon_id
+        return None
+    
     def get_cached_ammo(self, slot_id: int) -> Optional[Tuple[int, int]]:
         """Получение кэшированных патронов"""
         return self.ammo_cache.get(slot_id)
@@ -337,129 +794,276 @@ class MemoryReader:
         - Если G ≈ 0.0 → прицел КРАСНЫЙ → на враге
         
         Args:
-            debug_mode: Включить детальное логирование цепочки указателей
+            debug_mode: Перед проверкой вывести детальный лог цепочки указателей
         
         Returns:
             True если прицел на враге, False иначе
         """
-        if not self.is_connected():
-            if debug_mode:
-                logger.error("[TRIGGER DEBUG] ❌ Не подключено к процессу")
-            return False
+        if debug_mode:
+            self._trace_crosshair_chain()
         
-        # Проверяем наличие оффсетов
-        if 'crosshair_controller' not in self.offsets or self.offsets['crosshair_controller'] is None:
-            if debug_mode:
-                logger.error("[TRIGGER DEBUG] ❌ crosshair_controller не установлен в конфиге")
+        green_bits = self.poll_trigger_raw()
+        if green_bits < 0:
             return False
         
+        # Если G < 0.5 → красный → на враге
+        # Если G > 0.5 → белый → мимо
+        is_on_enemy = (green_bits < F32_HALF_BITS)
+        self._log_target_state(is_on_enemy)
+        return is_on_enemy
+    
+    def poll_trigger_raw(self) -> int:
+        """
+        Сырой опрос прицела для плотных циклов: без логов, bool и None
+        
+        Порог вызывающий сравнивает сам: 0 <= raw < F32_HALF_BITS - прицел красный
+        
+        Returns:
+            Биты float32 канала G (как uint32) или -1 при ошибке чтения
+        """
         try:
-            # Начинаем с базового адреса
-            base_offset = self.offsets['crosshair_controller']
-            address = self.module_base + base_offset
+            green_bits = self._read_crosshair_green(self._buf_u64, self._buf_u32, self._nread)
+        except Exception as e:
+            if _LOG_HOT:
+                logger.debug(f"[TRIGGER] Ошибка чтения цвета: {e}")
+            green_bits = None
+        
+        if green_bits is None:
+            return -1
+        return green_bits
+    
+    def _read_crosshair_green(self, ptr_buf: ctypes.c_uint64, bits_buf: ctypes.c_uint32,
+                              nread: ctypes.c_size_t) -> Optional[int]:
+        """
+        Проход по цепочке прицела и чтение Green канала в переданные буферы
+        
+        Свои буферы у каждого потока, поэтому метод можно звать из монитора прицела
+        
+        Returns:
+            Биты float32 канала G (как uint32) или None
+        """
+        address = self._abs_crosshair_root
+        handle = self._handle
+        if address is None or not self.is_connected():
+            return None
+        
+        # Идём по цепочке указателей
+        # ВСЕ оффсеты кроме последнего - разыменовываем (читаем указатель)
+        # Последний оффсет - просто прибавляем (до Green канала)
+        if handle is None:
+            for offset in self._crosshair_offsets:
+                address = self.read_pointer(address)
+                if not address:
+                    return None
+                address += offset
+            bits = self.read_int32(address)
+            return bits & 0xFFFFFFFF if bits is not None else None
+        
+        bits_ref = ctypes.byref(bits_buf)
+        nread_ref = ctypes.byref(nread)
+        
+        ptr_ref = ctypes.byref(ptr_buf)
+        
+        # Объекты UI почти не переезжают: пока не истёк TTL, вместо всей цепочки
+        # перечитываем только последний указатель и сверяем с прошлым проходом.
+        # Указатель изменился (объект освобождён/переехал) или цвет вне 0..1 - полный проход
+        now = time.monotonic()
+        tail = self._crosshair_tail
+        if tail is not None and now < self._crosshair_tail_expiry:
+            hop_address, hop_ptr, green_address = tail
+            if (_ReadProcessMemory(handle, hop_address, ptr_ref, 8, nread_ref) and nread.value == 8
+                    and ptr_buf.value == hop_ptr
+                    and _ReadProcessMemory(handle, green_address, bits_ref, 4, nread_ref) and nread.value == 4
+                    and bits_buf.value <= F32_ONE_BITS):
+                return bits_buf.value
+            self._crosshair_tail = None
+        
+        hop_address = None
+        ptr = 0
+        for offset in self._crosshair_offsets:
+            if not _ReadProcessMemory(handle, address, ptr_ref, 8, nread_ref) or nread.value != 8:
+                return None
+            ptr = ptr_buf.value
+            if not USER_ADDR_MIN <= ptr <= USER_ADDR_MAX:
+                return None
+            hop_address = address
+            address = ptr + offset
+        
+        # Читаем Green канал напрямую
+        if not _ReadProcessMemory(handle, address, bits_ref, 4, nread_ref) or nread.value != 4:
+            return None
+        
+        if hop_address is not None:
+            self._crosshair_tail = (hop_address, ptr, address)
+            self._crosshair_tail_expiry = now + CROSSHAIR_TAIL_TTL_S
+        return bits_buf.value
+    
+    def _log_target_state(self, is_on_enemy: bool):
+        """Логируем только изменения состояния прицела"""
+        if is_on_enemy != self.last_target_state:
+            if is_on_enemy:
+                logger.info(f"[TRIGGER] 🎯 Прицел КРАСНЫЙ - враг обнаружен!")
+            else:
+                logger.info(f"[TRIGGER] Прицел БЕЛЫЙ - цель потеряна")
+            self.last_target_state = is_on_enemy
+    
+    def start_target_monitor(self, interval: float = TARGET_MONITOR_INTERVAL_S):
+        """
+        Запустить фоновый монитор прицела
+        
+        Поток опрашивает цвет прицела с фиксированным шагом и при смене состояния
+        обновляет target_on_enemy и взводит target_event - потребителю не нужно
+        самому проходить цепочку указателей каждый кадр
+        
+        Args:
+            interval: Период опроса (сек)
+        """
+        if self._target_thread is not None and self._target_thread.is_alive():
+            return
+        
+        self.target_on_enemy = None  # Первый же опрос опубликует состояние
+        self.target_event.clear()
+        self._target_stop.clear()
+        self._target_thread = threading.Thread(
+            target=self._target_monitor_loop,
+            args=(interval,),
+            name="TargetMonitor",
+            daemon=True
+        )
+        self._target_thread.start()
+        logger.info("Монитор прицела запущен")
+    
+    def stop_target_monitor(self):
+        """Остановить фоновый монитор прицела"""
+        if self._target_thread is None:
+            return
+        
+        self._target_stop.set()
+        self._target_thread.join(timeout=1.0)
+        self._target_thread = None
+        self.target_on_enemy = False
+        self.target_event.clear()
+        logger.info("Монитор прицела остановлен")
+    
+    def is_target_monitor_running(self) -> bool:
+        """Работает ли фоновый монитор прицела"""
+        return self._target_thread is not None and self._target_thread.is_alive()
+    
+    def _target_monitor_loop(self, interval: float):
+        """Поток монитора прицела"""
+        # Собственные буферы: основной поток читает через self._buf_*
+        ptr_buf = ctypes.c_uint64()
+        bits_buf = ctypes.c_uint32()
+        nread = ctypes.c_size_t()
+        
+        while not self._target_stop.wait(interval):
+            try:
+                green_bits = self._read_crosshair_green(ptr_buf, bits_buf, nread)
+            except Exception as e:
+                if _LOG_HOT:
+                    logger.debug(f"[TRIGGER] Ошибка чтения цвета: {e}")
+                green_bits = None
             
-            if debug_mode:
-                logger.info("[TRIGGER DEBUG] ═══════════════════════════════════════════")
-                logger.info(f"[TRIGGER DEBUG] 🎨 ПРОВЕРКА ЦВЕТА ПРИЦЕЛА")
-                logger.info(f"[TRIGGER DEBUG] GameAssembly.dll база: 0x{self.module_base:X}")
-                logger.info(f"[TRIGGER DEBUG] Базовый оффсет: 0x{base_offset:X}")
-                logger.info(f"[TRIGGER DEBUG] Шаг 0 (начало): 0x{address:X}")
+            is_on_enemy = green_bits is not None and green_bits < F32_HALF_BITS
+            if is_on_enemy != self.target_on_enemy:
+                self.target_on_enemy = is_on_enemy
+                self._log_target_state(is_on_enemy)
+                self.target_event.set()
+    
+    def _trace_crosshair_chain(self):
+        """
+        Детальный лог цепочки указателей прицела (диагностика)
+        
+        Вынесен из read_crosshair_on_enemy, чтобы первый кадр проверки
+        шёл тем же путём, что и все последующие
+        """
+        if not self.is_connected():
+            logger.error("[TRIGGER DEBUG] ❌ Не подключено к процессу")
+            return
+        
+        base_offset = self.offsets.get('crosshair_controller')
+        if base_offset is None:
+            logger.error("[TRIGGER DEBUG] ❌ crosshair_controller не установлен в конфиге")
+            return
+        
+        try:
+            address = self.module_base + base_offset
             
-            # Идём по цепочке указателей
-            # ВСЕ оффсеты кроме последнего - разыменовываем (читаем указатель)
-            # Последний оффсет - просто прибавляем (до Green канала)
-            crosshair_offsets = self.offsets.get('crosshair_offsets', [])
+            logger.info("[TRIGGER DEBUG] ═══════════════════════════════════════════")
+            logger.info(f"[TRIGGER DEBUG] 🎨 ПРОВЕРКА ЦВЕТА ПРИЦЕЛА")
+            logger.info(f"[TRIGGER DEBUG] GameAssembly.dll база: 0x{self.module_base:X}")
+            logger.info(f"[TRIGGER DEBUG] Базовый оффсет: 0x{base_offset:X}")
+            logger.info(f"[TRIGGER DEBUG] Шаг 0 (начало): 0x{address:X}")
             
-            for i, offset in enumerate(crosshair_offsets):
-                # Читаем указатель
+            for i, offset in enumerate(self.offsets.get('crosshair_offsets', [])):
                 prev_address = address
                 address = self.read_pointer(address)
                 
-                if debug_mode:
-                    if address is None:
-                        logger.error(f"[TRIGGER DEBUG] ❌ Шаг {i+1}: не удалось прочитать указатель по 0x{prev_address:X}")
-                        return False
-                    elif address == 0:
-                        logger.error(f"[TRIGGER DEBUG] ❌ Шаг {i+1}: указатель = NULL (0x0)")
-                        return False
-                    else:
-                        logger.info(f"[TRIGGER DEBUG] ✅ Шаг {i+1}: [0x{prev_address:X}] → 0x{address:X}, затем +0x{offset:X}")
-                
-                if address is None or address == 0:
-                    return False
+                if address is None:
+                    logger.error(f"[TRIGGER DEBUG] ❌ Шаг {i+1}: не удалось прочитать указатель по 0x{prev_address:X}")
+                    return
+                if address == 0:
+                    logger.error(f"[TRIGGER DEBUG] ❌ Шаг {i+1}: указатель = NULL (0x0)")
+                    return
+                logger.info(f"[TRIGGER DEBUG] ✅ Шаг {i+1}: [0x{prev_address:X}] → 0x{address:X}, затем +0x{offset:X}")
                 
-                # Прибавляем оффсет
                 address += offset
-                
-                if debug_mode:
-                    logger.info(f"[TRIGGER DEBUG]         → Итого: 0x{address:X}")
+                logger.info(f"[TRIGGER DEBUG]         → Итого: 0x{address:X}")
             
             # Финальный адрес - это UISprite (после всех оффсетов)
-            if debug_mode:
-                logger.info(f"[TRIGGER DEBUG] ✅ Адрес Green канала: 0x{address:X}")
-            
-            # Читаем Green канал напрямую
-            green_value = self.read_float(address)
+            logger.info(f"[TRIGGER DEBUG] ✅ Адрес Green канала: 0x{address:X}")
             
-            if debug_mode:
-                if green_value is None:
-                    logger.error(f"[TRIGGER DEBUG] ❌ Не удалось прочитать Green по 0x{address:X}")
-                else:
-                    # Читаем и другие каналы для полной картины
-                    r = self.read_float(address - 0x4)  # R на -4 от G
-                    g = green_value
-                    b = self.read_float(address + 0x4)  # B на +4 от G
-                    a = self.read_float(address + 0x8)  # A на +8 от G
-                    logger.info(f"[TRIGGER DEBUG] Цвет прицела: R={r:.2f}, G={g:.2f}, B={b:.2f}, A={a:.2f}")
+            # Все 4 канала одним чтением: R на -4 от G, B на +4, A на +8
+            rgba = self.read_bytes(address - 0x4, _RGBA.size)
+            if rgba is None:
+                logger.error(f"[TRIGGER DEBUG] ❌ Не удалось прочитать цвет по 0x{address - 0x4:X}")
+                return
             
-            if green_value is None:
-                return False
-            
-            # Если G < 0.5 → красный → на враге
-            # Если G > 0.5 → белый → мимо
-            is_on_enemy = (green_value < 0.5)
-            
-            # Логируем только изменения состояния
-            if is_on_enemy != self.last_target_state:
-                if is_on_enemy:
-                    logger.info(f"[TRIGGER] 🎯 Прицел КРАСНЫЙ - враг обнаружен!")
-                else:
-                    logger.info(f"[TRIGGER] Прицел БЕЛЫЙ - цель потеряна")
-                self.last_target_state = is_on_enemy
-            
-            if debug_mode:
-                logger.info(f"[TRIGGER DEBUG] Результат: {'🔴 КРАСНЫЙ (на враге)' if is_on_enemy else '⚪ БЕЛЫЙ (мимо)'}")
-                logger.info("[TRIGGER DEBUG] ═══════════════════════════════════════════")
-            
-            return is_on_enemy
+            r, g, b, a = _RGBA.unpack(rgba)
+            logger.info(f"[TRIGGER DEBUG] Цвет прицела: R={r:.2f}, G={g:.2f}, B={b:.2f}, A={a:.2f}")
+            logger.info(f"[TRIGGER DEBUG] Результат: {'🔴 КРАСНЫЙ (на враге)' if g < 0.5 else '⚪ БЕЛЫЙ (мимо)'}")
+            logger.info("[TRIGGER DEBUG] ═══════════════════════════════════════════")
         
         except Exception as e:
-            if debug_mode:
-                logger.error(f"[TRIGGER DEBUG] ❌ ОШИБКА: {e}")
-            else:
-                logger.debug(f"[TRIGGER] Ошибка чтения цвета: {e}")
-            return False
+            logger.error(f"[TRIGGER DEBUG] ❌ ОШИБКА: {e}")
     
-    def update_all(self) -> Dict:
+    def tick(self) -> Dict:
         """
-        Обновление всех данных
+        Обновление всех данных за один тик
+        
+        Цепочка слотов проходится не чаще раза в SLOTS_BASE_TTL_S, активное оружие
+        читается сразу за таблицей слотов, состояние прицела берётся у монитора
+        (если он запущен) без повторного прохода по цепочке прицела.
+        Цепочка прицела начинается с другого корня (AimCrosshairController),
+        поэтому общего участка с цепочкой слотов у неё нет.
         
         Returns:
             Словарь с обновлённой информацией
         """
-        data = {
-            'ammo': self.read_all_ammo(),
-            'active_weapon': self.read_active_weapon(),
+        self.active_weapon = None
+        ammo = self.read_all_ammo(with_active_weapon=True)
+        
+        if self.is_target_monitor_running():
+            on_enemy = bool(self.target_on_enemy)
+        else:
+            on_enemy = self.read_crosshair_on_enemy()
+        
+        return {
+            'ammo': ammo,
+            'active_weapon': self.active_weapon if ammo else self.read_active_weapon(),
+            'on_enemy': on_enemy,
             'timestamp': time.time()
         }
-        
-        return data
     
     def disconnect(self):
         """Отключение от процесса"""
         if self.pm:
             self.pm = None
+            self._handle = None
+            self._bind_readers()
             self.base_address = None
+            self._resolve_addresses()
+            self.invalidate_slots_base()
             logger.info("Отключено от процесса")
     
     def get_status(self) -> str:
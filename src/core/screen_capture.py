@@ -3,12 +3,27 @@
 Захват определённых областей экрана для анализа
 """
 
+import platform
+import cv2
 import mss
 import numpy as np
 from PIL import Image
 from typing import Tuple, Optional, Dict
 from loguru import logger
 
+try:
+    import dxcam
+    DXCAM_AVAILABLE = True
+except ImportError:
+    DXCAM_AVAILABLE = False
+
+
+# Предел кэша словарей регионов (регионы постоянные, кэш не должен расти бесконечно)
+REGION_CACHE_LIMIT = 64
+# Несколько регионов снимаются одним кадром, если их общая рамка не больше
+# суммы площадей, умноженной на этот коэффициент
+BATCH_AREA_RATIO = 1.5
+
 
 class ScreenCapture:
     """Класс для захвата экрана и определённых областей"""
@@ -17,6 +32,8 @@ class ScreenCapture:
         """Инициализация захвата экрана"""
         self.sct = mss.mss()
         self.screen_size = self._get_screen_size()
+        # (x, y, width, height) -> словарь региона для mss, переиспользуется между кадрами
+        self._region_cache: Dict[Tuple[int, int, int, int], Dict] = {}
         logger.info(f"ScreenCapture инициализирован. Разрешение экрана: {self.screen_size}")
     
     def _get_screen_size(self) -> Tuple[int, int]:
@@ -43,22 +60,42 @@ class ScreenCapture:
             Numpy array с изображением в формате RGB
         """
         try:
-            monitor = {
-                "top": y,
-                "left": x,
-                "width": width,
-                "height": height
-            }
+            key = (x, y, width, height)
+            monitor = self._region_cache.get(key)
+            if monitor is None:
+                if len(self._region_cache) >= REGION_CACHE_LIMIT:
+                    self._region_cache.clear()
+                monitor = self._region_cache[key] = {
+                    "top": y,
+                    "left": x,
+                    "width": width,
+                    "height": height
+                }
             
             screenshot = self.sct.grab(monitor)
-            img = Image.frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
-            
-            return np.array(img)
+            return self._bgra_to_rgb(screenshot)
         
         except Exception as e:
             logger.error(f"Ошибка при захвате области ({x}, {y}, {width}, {height}): {e}")
             return np.array([])
     
+    @staticmethod
+    def _bgra_to_rgb(screenshot) -> np.ndarray:
+        """
+        Перевод кадра mss (BGRA) в RGB без промежуточного PIL.Image
+        
+        numpy-вид прямо поверх буфера mss, перестановка каналов - один проход
+        cv2.cvtColor (векторизованный SSE/AVX2 код OpenCV) в непрерывный массив
+        
+        Args:
+            screenshot: Результат sct.grab()
+            
+        Returns:
+            Numpy array (height, width, 3) в формате RGB
+        """
+        bgra = np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2RGB)
+    
     def capture_region_percent(self, x_percent: float, y_percent: float,
                               width_percent: float, height_percent: float) -> np.ndarray:
         """
@@ -74,6 +111,11 @@ class ScreenCapture:
         Returns:
             Numpy array с изображением
         """
+        return self.capture_region(*self._percent_to_rect(x_percent, y_percent, width_percent, height_percent))
+    
+    def _percent_to_rect(self, x_percent: float, y_percent: float,
+                         width_percent: float, height_percent: float) -> Tuple[int, int, int, int]:
+        """Перевод процентных координат в пиксели (x, y, width, height)"""
         screen_width, screen_height = self.screen_size
         
         x = int((x_percent / 100) * screen_width)
@@ -81,7 +123,7 @@ class ScreenCapture:
         width = int((width_percent / 100) * screen_width)
         height = int((height_percent / 100) * screen_height)
         
-        return self.capture_region(x, y, width, height)
+        return x, y, width, height
     
     def capture_multiple_regions(self, regions: Dict[str, Dict]) -> Dict[str, np.ndarray]:
         """
@@ -94,11 +136,12 @@ class ScreenCapture:
             Словарь {name: image_array}
         """
         captured = {}
+        rects = {}
         
         for name, region in regions.items():
             if 'x_percent' in region:
                 # Используем процентные координаты
-                img = self.capture_region_percent(
+                rects[name] = self._percent_to_rect(
                     region['x_percent'],
                     region['y_percent'],
                     region['width_percent'],
@@ -106,13 +149,28 @@ class ScreenCapture:
                 )
             else:
                 # Используем абсолютные координаты
-                img = self.capture_region(
-                    region['x'],
-                    region['y'],
-                    region['width'],
-                    region['height']
-                )
+                rects[name] = (region['x'], region['y'], region['width'], region['height'])
+        
+        if len(rects) > 1:
+            # Регионы рядом - один захват общей рамки и срезы numpy вместо N захватов
+            min_x = min(r[0] for r in rects.values())
+            min_y = min(r[1] for r in rects.values())
+            max_x = max(r[0] + r[2] for r in rects.values())
+            max_y = max(r[1] + r[3] for r in rects.values())
+            bbox_area = (max_x - min_x) * (max_y - min_y)
+            total_area = sum(r[2] * r[3] for r in rects.values())
             
+            if bbox_area <= BATCH_AREA_RATIO * total_area:
+                big = self.capture_region(min_x, min_y, max_x - min_x, max_y - min_y)
+                if big.size > 0:
+                    for name, (x, y, width, height) in rects.items():
+                        img = big[y - min_y:y - min_y + height, x - min_x:x - min_x + width]
+                        if img.size > 0:
+                            captured[name] = img
+                return captured
+        
+        for name, (x, y, width, height) in rects.items():
+            img = self.capture_region(x, y, width, height)
             if img.size > 0:
                 captured[name] = img
         
@@ -160,3 +218,90 @@ class ScreenCapture:
         if hasattr(self, 'sct'):
             self.sct.close()
 
+
+class ScreenCaptureDXGI(ScreenCapture):
+    """
+    Захват через DXGI Desktop Duplication (dxcam), только Windows
+    
+    Камера сама получает кадры основного монитора в фоне, capture_region
+    вырезает область из последнего кадра вместо отдельного BitBlt на каждый вызов.
+    mss остаётся для списка мониторов и сохранения скриншотов
+    """
+    
+    def __init__(self, target_fps: int = 120):
+        """
+        Инициализация захвата
+        
+        Args:
+            target_fps: Частота кадров камеры
+        """
+        if not DXCAM_AVAILABLE:
+            raise ImportError("dxcam не установлен!")
+        
+        super().__init__()
+        self.camera = dxcam.create(output_idx=0, output_color="RGB")
+        if self.camera is None:
+            raise RuntimeError("Не удалось создать камеру dxcam")
+        self.camera.start(target_fps=target_fps, video_mode=True)
+        
+        # Кадр камеры - основной монитор, координаты регионов - виртуальный экран
+        primary = self.sct.monitors[1]
+        self._origin = (primary['left'], primary['top'])
+        logger.info(f"ScreenCaptureDXGI запущен ({target_fps} FPS)")
+    
+    def capture_region(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        """
+        Вырезать область из последнего кадра камеры
+        
+        Области вне основного монитора снимаются обычным захватом mss
+        
+        Args:
+            x: X координата левого верхнего угла
+            y: Y координата левого верхнего угла
+            width: Ширина области
+            height: Высота области
+            
+        Returns:
+            Numpy array с изображением в формате RGB
+        """
+        try:
+            frame = self.camera.get_latest_frame()
+            if frame is None:
+                return np.array([])
+            
+            left = x - self._origin[0]
+            top = y - self._origin[1]
+            # Область не целиком на основном мониторе (отрицательные индексы срез
+            # перенёс бы к другому краю кадра, выход за край молча обрезал бы) - через mss
+            if (left < 0 or top < 0 or width <= 0 or height <= 0
+                    or top + height > frame.shape[0] or left + width > frame.shape[1]):
+                return super().capture_region(x, y, width, height)
+            
+            # Кадр принадлежит кольцевому буферу камеры - копируем только область
+            return frame[top:top + height, left:left + width].copy()
+        
+        except Exception as e:
+            logger.error(f"Ошибка при захвате области ({x}, {y}, {width}, {height}): {e}")
+            return np.array([])
+    
+    def __del__(self):
+        """Очистка ресурсов"""
+        if hasattr(self, 'camera') and self.camera is not None:
+            self.camera.stop()
+        super().__del__()
+
+
+def create_screen_capture() -> ScreenCapture:
+    """
+    Выбор способа захвата: DXGI на Windows (если есть dxcam), иначе mss
+    
+    Returns:
+        Экземпляр ScreenCapture
+    """
+    if platform.system() == "Windows" and DXCAM_AVAILABLE:
+        try:
+            return ScreenCaptureDXGI()
+        except Exception as e:
+            logger.warning(f"⚠️ DXGI захват недоступен, используем mss: {e}")
+    
+    return ScreenCapture()
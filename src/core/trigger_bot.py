@@ -4,8 +4,12 @@
 
 import time
 import random
+from array import array
 from loguru import logger
 
+from src.utils.send_input import make_mouse_inputs, send_input
+from src.utils.game_window import find_game_window
+
 try:
     import win32api
     import win32con
@@ -15,16 +19,37 @@ except ImportError:
     WIN32_AVAILABLE = False
     logger.warning("pywin32 не установлен. Установите: pip install pywin32")
 
+# Как часто пересчитывать центр окна (на случай изменения размера), сек
+CENTRE_REFRESH_S = 2.0
+
+# Размер кольцевого буфера заранее сгенерированных задержек реакции (степень двойки)
+DELAY_BUFFER_SIZE = 1024
+
+
+def _wait_ns(delay_ns: int):
+    """
+    Точное ожидание: time.sleep на основную часть + добивка perf_counter_ns
+    
+    Args:
+        delay_ns: Длительность в наносекундах
+    """
+    end = time.perf_counter_ns() + delay_ns
+    if delay_ns > 3_000_000:
+        time.sleep((delay_ns - 2_000_000) / 1e9)
+    while time.perf_counter_ns() < end:
+        pass
+
 
 class TriggerBot:
     """Триггер-бот для автоматической стрельбы"""
     
-    def __init__(self, memory_reader):
+    def __init__(self, memory_reader, input_state=None):
         """
         Инициализация триггер-бота
         
         Args:
             memory_reader: Экземпляр MemoryReader
+            input_state: Общий опрос ввода (InputState), если есть
         """
         if not WIN32_AVAILABLE:
             raise ImportError("pywin32 не установлен!")
@@ -38,27 +63,43 @@ class TriggerBot:
         self.reaction_delay_max = 0.15  # Максимальная задержка реакции (сек)
         self.shot_duration = 0.05       # Длительность нажатия ЛКМ (сек)
         
+        # Задержки реакции (нс) генерируются пачкой при смене настроек, а не на каждый выстрел
+        self._delays_ns = array('q')
+        self._delay_idx = 0
+        self._fill_delays()
+        
         # Состояние
         self.last_state = False  # Был ли враг в прошлом кадре
         self.is_holding = False  # Зажата ли кнопка мыши
         self.first_check = True  # Флаг первой проверки (для debug лога)
         
+        # Предсобранные INPUT (нажатие, отпускание) ЛКМ для SendInput
+        self._mouse_inputs = make_mouse_inputs()
+        self._held_by_send_input = False  # Чем зажата кнопка - отпускаем тем же способом
+        
+        # lParam центра окна для PostMessage (считается при включении, не на каждый клик)
+        self._centre_lparam = 0
+        self._centre_time = 0.0
+        
+        # Обновление по тику общего InputState
+        if input_state is not None:
+            input_state.subscribe(self._on_input)
+        
         logger.info("TriggerBot инициализирован")
     
     def enable(self):
         """Включить триггер-бот"""
         # Ищем окно игры
-        self.game_hwnd = win32gui.FindWindow(None, "Pixel Gun 3D")
-        
-        if not self.game_hwnd:
-            # Пробуем альтернативные названия
-            self.game_hwnd = win32gui.FindWindow(None, "Pixel Gun 3D - Unity")
+        self.game_hwnd = find_game_window()
         
         if not self.game_hwnd:
             logger.error("❌ Окно игры не найдено!")
             return False
         
+        self._update_centre_lparam()
         self.enabled = True
+        self.first_check = True
+        self.memory_reader.start_target_monitor()
         logger.info(f"✅ Триггер-бот ВКЛЮЧЕН (HWND: {self.game_hwnd})")
         return True
     
@@ -68,6 +109,7 @@ class TriggerBot:
         if self.is_holding:
             self._release_mouse()
         
+        self.memory_reader.stop_target_monitor()
         self.enabled = False
         logger.info("⏸ Триггер-бот ВЫКЛЮЧЕН")
     
@@ -81,8 +123,16 @@ class TriggerBot:
         """
         self.reaction_delay_min = min_ms / 1000.0
         self.reaction_delay_max = max_ms / 1000.0
+        self._fill_delays()
         logger.info(f"Задержка реакции: {min_ms}-{max_ms} мс")
     
+    def _fill_delays(self):
+        """Заполнить кольцевой буфер случайных задержек реакции"""
+        low = int(self.reaction_delay_min * 1e9)
+        high = int(self.reaction_delay_max * 1e9)
+        self._delays_ns = array('q', (int(random.uniform(low, high)) for _ in range(DELAY_BUFFER_SIZE)))
+        self._delay_idx = 0
+    
     def update(self):
         """Обновление триггер-бота (вызывать в основном цикле)"""
         if not self.enabled:
@@ -96,7 +146,16 @@ class TriggerBot:
                 self.first_check = False
             
             # Проверяем наведён ли прицел на врага
-            is_on_enemy = self.memory_reader.read_crosshair_on_enemy(debug_mode=debug_mode)
+            reader = self.memory_reader
+            if reader.is_target_monitor_running() and not debug_mode:
+                # Монитор прицела публикует только переходы - без события делать нечего
+                event = reader.target_event
+                if not event.is_set():
+                    return
+                event.clear()
+                is_on_enemy = bool(reader.target_on_enemy)
+            else:
+                is_on_enemy = reader.read_crosshair_on_enemy(debug_mode=debug_mode)
             
             # Логируем изменения состояния
             if is_on_enemy != self.last_state:
@@ -117,34 +176,60 @@ class TriggerBot:
         except Exception as e:
             logger.error(f"[TRIGGER] Ошибка: {e}")
     
+    def release(self):
+        """Отпустить ЛКМ, если зажата (например, при потере фокуса окном игры)"""
+        if self.is_holding:
+            self._release_mouse()
+        self.last_state = False
+    
+    def pause(self):
+        """
+        Приостановить на время, пока окно игры не в фокусе
+        
+        Отпускает ЛКМ и останавливает монитор прицела - в фоне память не читается
+        """
+        self.release()
+        self.memory_reader.stop_target_monitor()
+    
+    def resume(self):
+        """Продолжить после возврата фокуса в игру (если триггер-бот включён)"""
+        if self.enabled:
+            self.memory_reader.start_target_monitor()
+    
+    def _on_input(self, keys, foreground):
+        """Подписчик InputState"""
+        self.update()
+    
     def _press_mouse(self):
         """Зажать левую кнопку мыши"""
         try:
             if not self.game_hwnd or not win32gui.IsWindow(self.game_hwnd):
-                self.game_hwnd = win32gui.FindWindow(None, "Pixel Gun 3D")
+                self.game_hwnd = find_game_window()
                 if not self.game_hwnd:
                     return
+                self._centre_time = 0.0  # Новое окно - центр пересчитаем
             
-            # Небольшая задержка реакции
-            reaction_delay = random.uniform(self.reaction_delay_min, self.reaction_delay_max)
-            time.sleep(reaction_delay)
-            
-            # Получаем центр окна
-            rect = win32gui.GetClientRect(self.game_hwnd)
-            center_x = rect[2] // 2
-            center_y = rect[3] // 2
-            lParam = win32api.MAKELONG(center_x, center_y)
+            # Небольшая задержка реакции (следующая из буфера)
+            delay_ns = self._delays_ns[self._delay_idx]
+            self._delay_idx = (self._delay_idx + 1) & (DELAY_BUFFER_SIZE - 1)
+            _wait_ns(delay_ns)
             
-            # Зажимаем ЛКМ
-            win32api.PostMessage(
-                self.game_hwnd,
-                win32con.WM_LBUTTONDOWN,
-                win32con.MK_LBUTTON,
-                lParam
-            )
+            # Игра на переднем плане - SendInput сразу в очередь ввода ОС, без очереди сообщений окна
+            if self._mouse_inputs and win32gui.GetForegroundWindow() == self.game_hwnd:
+                send_input(self._mouse_inputs[0])
+                self._held_by_send_input = True
+            else:
+                # Зажимаем ЛКМ
+                win32api.PostMessage(
+                    self.game_hwnd,
+                    win32con.WM_LBUTTONDOWN,
+                    win32con.MK_LBUTTON,
+                    self._get_centre_lparam()
+                )
+                self._held_by_send_input = False
             
             self.is_holding = True
-            logger.debug(f"[TRIGGER] Зажали ЛКМ (задержка: {reaction_delay*1000:.0f}мс)")
+            logger.debug(f"[TRIGGER] Зажали ЛКМ (задержка: {delay_ns / 1e6:.0f}мс)")
             
         except Exception as e:
             logger.error(f"[TRIGGER] Ошибка зажатия: {e}")
@@ -152,21 +237,22 @@ class TriggerBot:
     def _release_mouse(self):
         """Отпустить левую кнопку мыши"""
         try:
-            if not self.game_hwnd or not win32gui.IsWindow(self.game_hwnd):
+            if self._held_by_send_input:
+                send_input(self._mouse_inputs[1])
+                self._held_by_send_input = False
+                self.is_holding = False
+                logger.debug(f"[TRIGGER] Отпустили ЛКМ")
                 return
             
-            # Получаем центр окна
-            rect = win32gui.GetClientRect(self.game_hwnd)
-            center_x = rect[2] // 2
-            center_y = rect[3] // 2
-            lParam = win32api.MAKELONG(center_x, center_y)
+            if not self.game_hwnd or not win32gui.IsWindow(self.game_hwnd):
+                return
             
             # Отпускаем ЛКМ
             win32api.PostMessage(
                 self.game_hwnd,
                 win32con.WM_LBUTTONUP,
                 0,
-                lParam
+                self._get_centre_lparam()
             )
             
             self.is_holding = False
@@ -175,6 +261,18 @@ class TriggerBot:
         except Exception as e:
             logger.error(f"[TRIGGER] Ошибка отпускания: {e}")
     
+    def _update_centre_lparam(self):
+        """Пересчитать lParam центра клиентской области окна игры"""
+        rect = win32gui.GetClientRect(self.game_hwnd)
+        self._centre_lparam = win32api.MAKELONG(rect[2] // 2, rect[3] // 2)
+        self._centre_time = time.monotonic()
+    
+    def _get_centre_lparam(self) -> int:
+        """lParam центра окна из кэша (обновляется раз в CENTRE_REFRESH_S)"""
+        if time.monotonic() - self._centre_time > CENTRE_REFRESH_S:
+            self._update_centre_lparam()
+        return self._centre_lparam
+    
     def get_status(self) -> str:
         """Получить статус триггер-бота"""
         if not self.enabled:
@@ -5,10 +5,16 @@
 
 import cv2
 import numpy as np
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from loguru import logger
 
 
+# Гистограмма HSV для сравнения индикатора с эталонами категорий
+HIST_CHANNELS = [0, 1, 2]
+HIST_BINS = [16, 16, 16]
+HIST_RANGES = [0, 180, 0, 256, 0, 256]
+
+
 class WeaponCategoryDetector:
     """
     Класс для определения категории активного оружия
@@ -36,6 +42,12 @@ class WeaponCategoryDetector:
         """Инициализация детектора категорий"""
         self.current_category = None
         self.category_templates = {}
+        # Гистограммы эталонов считаются один раз при добавлении
+        self._category_hists: Dict[int, np.ndarray] = {}
+        # Таблица "пиксель -> индекс ближайшего слота" для detect_category_by_position
+        self._slot_lut: Optional[np.ndarray] = None
+        self._slot_lut_origin = (0, 0)
+        self._slot_lut_positions: Optional[list] = None
         logger.info("WeaponCategoryDetector инициализирован")
     
     def get_category_info(self, category_id: int) -> Optional[Dict]:
@@ -98,11 +110,36 @@ class WeaponCategoryDetector:
         logger.warning("Определение категории по шаблону требует калибровки")
         return None
     
+    def add_category_template(self, category_id: int, indicator_image: np.ndarray):
+        """
+        Добавление эталона цветного индикатора для категории
+        
+        Args:
+            category_id: ID категории (1-6)
+            indicator_image: Изображение индикатора (RGB)
+        """
+        if category_id not in self.CATEGORIES:
+            logger.warning(f"Некорректная категория: {category_id}")
+            return
+        
+        self.category_templates[category_id] = indicator_image
+        self._category_hists[category_id] = self._calc_hsv_hist(indicator_image)
+        logger.debug(f"Добавлен эталон цвета для категории {self.get_category_name(category_id)}")
+    
+    @staticmethod
+    def _calc_hsv_hist(image: np.ndarray) -> np.ndarray:
+        """Нормированная гистограмма HSV 16x16x16"""
+        hsv = cv2.cvtColor(image, cv2.COLOR_RGB2HSV)
+        hist = cv2.calcHist([hsv], HIST_CHANNELS, None, HIST_BINS, HIST_RANGES)
+        cv2.normalize(hist, hist)
+        return hist
+    
     def detect_category_by_color(self, indicator_image: np.ndarray) -> Optional[int]:
         """
         Определение категории по цветному индикатору
         
-        Если в игре есть цветной индикатор текущего оружия
+        Если в игре есть цветной индикатор текущего оружия.
+        При наличии эталонов (add_category_template) - ближайший по χ² гистограмм HSV
         
         Args:
             indicator_image: Изображение индикатора
@@ -110,9 +147,16 @@ class WeaponCategoryDetector:
         Returns:
             ID категории (1-6) или None
         """
-        # Конвертируем в HSV для анализа цвета
         if len(indicator_image.shape) == 3:
-            hsv = cv2.cvtColor(indicator_image, cv2.COLOR_RGB2HSV)
+            if self._category_hists:
+                # Одна гистограмма индикатора против заранее посчитанных гистограмм эталонов
+                hist = self._calc_hsv_hist(indicator_image)
+                category_id = min(
+                    self._category_hists,
+                    key=lambda cat: cv2.compareHist(hist, self._category_hists[cat], cv2.HISTCMP_CHISQR_ALT)
+                )
+                logger.debug(f"Определена категория {category_id} по цвету")
+                return category_id
             
             # Находим доминирующий цвет
             dominant_color = self._get_dominant_color(indicator_image)
@@ -127,23 +171,29 @@ class WeaponCategoryDetector:
         """
         Определение доминирующего цвета в изображении
         
+        Доминирующий = самый частый цвет (мода) в палитре 5 бит на канал
+        
         Args:
             image: Изображение
             
         Returns:
-            RGB tuple доминирующего цвета
+            RGB tuple доминирующего цвета (центр ячейки палитры)
         """
-        # Изменяем размер для ускорения
-        small_image = cv2.resize(image, (50, 50))
+        # Большое изображение прореживаем срезом (вид без копии) вместо resize
+        if image.shape[0] > 256 or image.shape[1] > 256:
+            image = image[::4, ::4]
         
-        # Преобразуем в массив пикселей
-        pixels = small_image.reshape(-1, 3)
-        pixels = pixels.astype(float)
+        # Квантуем каналы до 5 бит и упаковываем пиксель в один индекс 0..32767
+        q = (image.reshape(-1, 3) >> 3).astype(np.uint16)
+        idx = (q[:, 0] << 10) | (q[:, 1] << 5) | q[:, 2]
         
-        # Находим средний цвет
-        avg_color = pixels.mean(axis=0)
+        # Самая частая ячейка палитры
+        mode_bin = int(np.bincount(idx, minlength=1 << 15).argmax())
         
-        return tuple(map(int, avg_color))
+        r = ((mode_bin >> 10) << 3) + 4
+        g = (((mode_bin >> 5) & 31) << 3) + 4
+        b = ((mode_bin & 31) << 3) + 4
+        return r, g, b
     
     def set_category_manually(self, category_id: int):
         """
@@ -167,6 +217,34 @@ class WeaponCategoryDetector:
         """
         return self.current_category
     
+    def calibrate_position_lut(self, slot_positions: list, bbox: Tuple[int, int, int, int]):
+        """
+        Предрасчёт ближайшего слота для каждого пикселя области
+        
+        Позиции слотов для разрешения постоянны - после калибровки
+        detect_category_by_position делает один поиск в таблице вместо цикла по слотам
+        
+        Args:
+            slot_positions: Список позиций 6 слотов [(x1,y1), (x2,y2), ...]
+            bbox: Область, где может быть подсвеченный слот (x, y, ширина, высота)
+        """
+        if len(slot_positions) != 6:
+            logger.warning("Должно быть ровно 6 позиций слотов")
+            return
+        
+        x0, y0, width, height = bbox
+        ys, xs = np.mgrid[y0:y0 + height, x0:x0 + width]
+        slots = np.asarray(slot_positions, dtype=np.int64)
+        
+        # Квадраты расстояний до каждого слота (6, H, W) - корень для argmin не нужен
+        dist = (xs[np.newaxis] - slots[:, 0, np.newaxis, np.newaxis]) ** 2 \
+            + (ys[np.newaxis] - slots[:, 1, np.newaxis, np.newaxis]) ** 2
+        
+        self._slot_lut = dist.argmin(axis=0).astype(np.uint8)
+        self._slot_lut_origin = (x0, y0)
+        self._slot_lut_positions = list(slot_positions)
+        logger.debug(f"Таблица слотов построена: {width}x{height}")
+    
     def detect_category_by_position(self, slot_positions: list, highlighted_position: tuple) -> Optional[int]:
         """
         Определение категории по позиции подсвеченного слота
@@ -185,13 +263,24 @@ class WeaponCategoryDetector:
             logger.warning("Должно быть ровно 6 позиций слотов")
             return None
         
-        # Находим ближайший слот к подсвеченной позиции
+        hx, hy = highlighted_position
+        
+        # Слоты откалиброваны - ответ из таблицы, если точка в её области
+        lut = self._slot_lut
+        if lut is not None and slot_positions == self._slot_lut_positions:
+            row = hy - self._slot_lut_origin[1]
+            col = hx - self._slot_lut_origin[0]
+            if 0 <= row < lut.shape[0] and 0 <= col < lut.shape[1]:
+                category_id = int(lut[row, col]) + 1
+                logger.debug(f"Определена категория {category_id} по позиции")
+                return category_id
+        
+        # Находим ближайший слот к подсвеченной позиции (сравниваем квадраты расстояний)
         min_distance = float('inf')
         closest_index = None
         
         for i, (sx, sy) in enumerate(slot_positions):
-            hx, hy = highlighted_position
-            distance = ((sx - hx) ** 2 + (sy - hy) ** 2) ** 0.5
+            distance = (sx - hx) ** 2 + (sy - hy) ** 2
             
             if distance < min_distance:
                 min_distance = distance
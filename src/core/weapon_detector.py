@@ -5,23 +5,43 @@
 
 import cv2
 import json
+import zlib
 import numpy as np
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple
 from loguru import logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Единый размер шаблонов (ширина, высота): иконка масштабируется один раз на кадр
+TEMPLATE_SIZE = (64, 64)
+
+# Шаг прореживания иконки для контрольной суммы кадра
+ICON_HASH_STEP = 4
+
+# Предфильтр: сигнатура 8x8 в градациях серого, полное сравнение только для K ближайших
+SIGNATURE_SIZE = (8, 8)
+PREFILTER_TOP_K = 5
+
 
 class WeaponDetector:
     """Класс для определения текущего оружия"""
     
     def __init__(self, templates_folder: str = "data/weapon_templates",
-                 match_threshold: float = 0.7):
+                 match_threshold: float = 0.55):
         """
         Инициализация детектора оружия
         
         Args:
             templates_folder: Папка с шаблонами иконок оружия
-            match_threshold: Минимальная схожесть для определения (0-1)
+            match_threshold: Минимальная схожесть для определения
+                (TM_CCOEFF_NORMED, -1..1; 0.55 соответствует прежнему порогу 0.7
+                для среднего CCOEFF_NORMED и CCORR_NORMED)
         """
         self.templates_folder = Path(templates_folder)
         self.match_threshold = match_threshold
@@ -29,6 +49,15 @@ class WeaponDetector:
         self.weapons_db = {}
         self.templates = {}
         
+        # Все шаблоны одним массивом (N, H*W*3): нормированные строки для пакетного сравнения
+        self._tpl_ids: List[str] = []
+        self._tpl_flat: Optional[np.ndarray] = None
+        self._tpl_sig: Optional[np.ndarray] = None  # (N, 64) int16
+        
+        # Результат для последней иконки: пока пиксели не меняются, сравнение не повторяем
+        self._last_icon_key: Optional[Tuple] = None
+        self._last_result: Optional[Dict] = None
+        
         # Создаём папку если её нет
         self.templates_folder.mkdir(parents=True, exist_ok=True)
         
@@ -45,10 +74,13 @@ class WeaponDetector:
         db_path = self.templates_folder / "weapons_db.json"
         
         if db_path.exists():
-            with open(db_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.weapon_categories = data.get('weapon_categories', {})
-                self.weapons_db = data.get('weapons', {})
+            if ORJSON_AVAILABLE:
+                data = orjson.loads(db_path.read_bytes())
+            else:
+                with open(db_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            self.weapon_categories = data.get('weapon_categories', {})
+            self.weapons_db = data.get('weapons', {})
             logger.info(f"Загружено категорий: {len(self.weapon_categories)}, оружий: {len(self.weapons_db)}")
         else:
             logger.warning("База данных не найдена, будет создана новая")
@@ -63,52 +95,171 @@ class WeaponDetector:
             'weapon_categories': self.weapon_categories,
             'weapons': self.weapons_db
         }
-        with open(db_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            # orjson пишет UTF-8 как есть (аналог ensure_ascii=False)
+            db_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(db_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         logger.debug("База данных оружия сохранена")
     
     def _load_templates(self):
-        """Загрузка шаблонов иконок оружия"""
+        """
+        Загрузка шаблонов иконок оружия
+        
+        Шаблоны хранятся в RGB - в том же порядке каналов, что отдаёт захват экрана,
+        чтобы не конвертировать каждый кадр
+        """
         for weapon_id, weapon_data in self.weapons_db.items():
             template_file = weapon_data.get('template_file')
             if template_file:
-                template_path = self.templates_folder / template_file
-                if template_path.exists():
-                    template = cv2.imread(str(template_path))
-                    if template is not None:
-                        self.templates[weapon_id] = template
-                        logger.debug(f"Загружен шаблон для {weapon_id}")
+                template = self._load_template(self.templates_folder / template_file)
+                if template is not None:
+                    self.templates[weapon_id] = template
+                    logger.debug(f"Загружен шаблон для {weapon_id}")
+        
+        self._rebuild_template_stack()
+    
+    def _load_template(self, template_path: Path) -> Optional[np.ndarray]:
+        """
+        Загрузка одного шаблона
+        
+        Рядом с PNG хранится уже декодированный массив .npy (RGB, TEMPLATE_SIZE):
+        PNG декодируется только если кэша нет или PNG изменён после него
+        
+        Args:
+            template_path: Путь к PNG шаблона
+            
+        Returns:
+            Шаблон RGB или None
+        """
+        cache_path = template_path.with_suffix('.npy')
+        png_exists = template_path.exists()
+        
+        if cache_path.exists() and (not png_exists or cache_path.stat().st_mtime >= template_path.stat().st_mtime):
+            try:
+                template = np.load(cache_path)
+                if template.shape == (TEMPLATE_SIZE[1], TEMPLATE_SIZE[0], 3) and template.dtype == np.uint8:
+                    return template
+                # Кэш от другого TEMPLATE_SIZE или подложен вручную - пересобираем из PNG
+                logger.debug(f"Кэш шаблона {cache_path.name} не подходит: {template.shape} {template.dtype}")
+            except (OSError, ValueError) as e:
+                logger.debug(f"Кэш шаблона {cache_path.name} не прочитан: {e}")
+        
+        if not png_exists:
+            return None
+        
+        template = cv2.imread(str(template_path))
+        if template is None:
+            return None
+        
+        template = cv2.cvtColor(self._to_template_size(template), cv2.COLOR_BGR2RGB)
+        self._save_template_cache(cache_path, template)
+        return template
+    
+    @staticmethod
+    def _save_template_cache(cache_path: Path, template: np.ndarray):
+        """Сохранить декодированный шаблон в .npy"""
+        try:
+            np.save(cache_path, template)
+        except OSError as e:
+            logger.debug(f"Не удалось сохранить кэш шаблона {cache_path.name}: {e}")
+    
+    def _rebuild_template_stack(self):
+        """Собрать шаблоны в одну матрицу нормированных векторов (после загрузки/добавления)"""
+        self._last_icon_key = None
+        self._last_result = None
+        self._tpl_ids = list(self.templates.keys())
+        if not self._tpl_ids:
+            self._tpl_flat = None
+            self._tpl_sig = None
+            return
+        
+        stack = np.stack([self.templates[weapon_id] for weapon_id in self._tpl_ids], axis=0)
+        self._tpl_flat = self._normalize_flat(stack)
+        self._tpl_sig = np.stack([self._signature(template) for template in stack], axis=0)
+    
+    @staticmethod
+    def _signature(image: np.ndarray) -> np.ndarray:
+        """
+        Грубая сигнатура изображения для предфильтра
+        
+        Args:
+            image: Изображение RGB
+            
+        Returns:
+            Вектор 8x8 яркостей int16 за вычетом средней (не зависит от общей яркости)
+        """
+        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        sig = cv2.resize(gray, SIGNATURE_SIZE, interpolation=cv2.INTER_AREA).astype(np.int16).ravel()
+        sig -= int(sig.mean())
+        return sig
+    
+    @staticmethod
+    def _normalize_flat(images: np.ndarray) -> np.ndarray:
+        """
+        Центрирование по каналам и нормировка, как в TM_CCOEFF_NORMED
+        
+        Args:
+            images: Массив (N, H, W, 3) uint8
+            
+        Returns:
+            Массив (N, H*W*3) float32 с единичной нормой строк (нулевые строки для однотонных картинок)
+        """
+        data = images.astype(np.float32)
+        data -= data.mean(axis=(1, 2), keepdims=True)
+        flat = data.reshape(len(images), -1)
+        norms = np.linalg.norm(flat, axis=1, keepdims=True)
+        np.divide(flat, norms, out=flat, where=norms > 0)
+        flat[norms[:, 0] == 0] = 0.0
+        return flat
     
     def detect_weapon(self, icon_image: np.ndarray) -> Optional[Dict]:
         """
         Определение оружия по иконке
         
         Args:
-            icon_image: Изображение иконки оружия
+            icon_image: Изображение иконки оружия (RGB, как из ScreenCapture)
             
         Returns:
             Словарь с информацией об оружии или None
         """
-        if len(self.templates) == 0:
+        if self._tpl_flat is None:
             logger.warning("Нет загруженных шаблонов для определения оружия")
             return None
         
-        best_match = None
-        best_score = 0.0
+        # Та же иконка, что и в прошлый раз (оружие не менялось) - отдаём прошлый результат
+        icon_key = (icon_image.shape, zlib.crc32(icon_image[::ICON_HASH_STEP, ::ICON_HASH_STEP].tobytes()))
+        if icon_key == self._last_icon_key:
+            return self._last_result.copy() if self._last_result is not None else None
         
-        # Конвертируем в BGR если нужно (для OpenCV)
-        if len(icon_image.shape) == 3 and icon_image.shape[2] == 3:
-            icon_bgr = cv2.cvtColor(icon_image, cv2.COLOR_RGB2BGR)
-        else:
-            icon_bgr = icon_image
+        result = self._match_icon(icon_image)
+        self._last_icon_key = icon_key
+        self._last_result = result
+        return result.copy() if result is not None else None
+    
+    def _match_icon(self, icon_image: np.ndarray) -> Optional[Dict]:
+        """Сравнение иконки со всеми шаблонами (без кэша)"""
+        # Все шаблоны одного размера - масштабируем иконку один раз
+        icon_resized = self._to_template_size(icon_image)
+        if icon_resized.ndim == 2:
+            icon_resized = cv2.cvtColor(icon_resized, cv2.COLOR_GRAY2RGB)
         
-        # Сравниваем со всеми шаблонами
-        for weapon_id, template in self.templates.items():
-            score = self._compare_images(icon_bgr, template)
-            
-            if score > best_score:
-                best_score = score
-                best_match = weapon_id
+        vector = self._normalize_flat(icon_resized[np.newaxis])[0]
+        
+        if len(self._tpl_ids) > PREFILTER_TOP_K:
+            # Отбрасываем явно непохожие шаблоны по сигнатуре, полное сравнение - только для K ближайших
+            distances = np.abs(self._tpl_sig - self._signature(icon_resized)).sum(axis=1)
+            candidates = np.argpartition(distances, PREFILTER_TOP_K)[:PREFILTER_TOP_K]
+            scores = self._tpl_flat[candidates] @ vector
+            best_index = int(candidates[scores.argmax()])
+            best_score = float(scores.max())
+        else:
+            # Сравнение со всеми шаблонами одним умножением матрицы на вектор (и иконка, и шаблоны в RGB)
+            scores = self._tpl_flat @ vector
+            best_index = int(scores.argmax())
+            best_score = float(scores[best_index])
+        best_match = self._tpl_ids[best_index]
         
         # Проверяем порог
         if best_score >= self.match_threshold:
@@ -121,40 +272,13 @@ class WeaponDetector:
             logger.debug(f"Оружие не определено (лучший score: {best_score:.2f})")
             return None
     
-    def _compare_images(self, img1: np.ndarray, img2: np.ndarray) -> float:
-        """
-        Сравнение двух изображений методом Template Matching
-        
-        Args:
-            img1: Первое изображение
-            img2: Второе изображение (шаблон)
-            
-        Returns:
-            Коэффициент схожести (0-1)
-        """
-        try:
-            # Приводим к одному размеру
-            h, w = img2.shape[:2]
-            img1_resized = cv2.resize(img1, (w, h))
-            
-            # Используем несколько методов сравнения
-            methods = [
-                cv2.TM_CCOEFF_NORMED,
-                cv2.TM_CCORR_NORMED,
-            ]
-            
-            scores = []
-            for method in methods:
-                result = cv2.matchTemplate(img1_resized, img2, method)
-                _, max_val, _, _ = cv2.minMaxLoc(result)
-                scores.append(max_val)
-            
-            # Возвращаем среднее значение
-            return sum(scores) / len(scores)
-        
-        except Exception as e:
-            logger.error(f"Ошибка при сравнении изображений: {e}")
-            return 0.0
+    @staticmethod
+    def _to_template_size(image: np.ndarray) -> np.ndarray:
+        """Привести изображение к TEMPLATE_SIZE (без копии, если размер уже совпадает)"""
+        h, w = image.shape[:2]
+        if (w, h) == TEMPLATE_SIZE:
+            return image
+        return cv2.resize(image, TEMPLATE_SIZE, interpolation=cv2.INTER_AREA)
     
     def add_weapon(self, weapon_id: str, name: str, category: int,
                    max_ammo: int, magazine_size: int, icon_image: np.ndarray = None):
@@ -184,12 +308,17 @@ class WeaponDetector:
         # Сохраняем иконку если предоставлена
         if icon_image is not None:
             template_path = self.templates_folder / template_file
+            icon_image = self._to_template_size(icon_image)
             if len(icon_image.shape) == 3:
                 icon_bgr = cv2.cvtColor(icon_image, cv2.COLOR_RGB2BGR)
             else:
                 icon_bgr = icon_image
             cv2.imwrite(str(template_path), icon_bgr)
-            self.templates[weapon_id] = icon_bgr
+            if icon_image.ndim == 2:
+                icon_image = cv2.cvtColor(icon_image, cv2.COLOR_GRAY2RGB)
+            self._save_template_cache(template_path.with_suffix('.npy'), icon_image)
+            self.templates[weapon_id] = icon_image
+            self._rebuild_template_stack()
         
         self._save_weapons_database()
         logger.info(f"Добавлено новое оружие: {name} (ID: {weapon_id}, категория: {category})")
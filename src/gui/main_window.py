@@ -679,10 +679,9 @@ class MainWindow(QMainWindow):
             self.weapon_rows[weapon_id].update_ammo(clip, reserve)
     
     def update_all_weapons(self, ammo_data: dict):
-        for wid in range(1, 7):
-            if wid in ammo_data:
-                clip, reserve = ammo_data[wid]
-                self.update_weapon_ammo(wid, clip, reserve)
+        # ammo_data может быть частичным - только изменившиеся слоты
+        for wid, (clip, reserve) in ammo_data.items():
+            self.update_weapon_ammo(wid, clip, reserve)
     
     def update_fps(self, fps: float):
         self.fps_label.setText(f"FPS: {fps:.1f}")
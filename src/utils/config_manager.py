@@ -5,7 +5,7 @@
 
 import yaml
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional
 from loguru import logger
 
 
@@ -25,6 +25,9 @@ class ConfigManager:
         self.user_config_path = Path(user_config_path)
         self.config: Dict[str, Any] = {}
         
+        # Подписчики на изменения: callback(key_path), None - изменилось всё
+        self._listeners: List[Callable[[Optional[str]], None]] = []
+        
         self.load_config()
     
     def load_config(self) -> Dict[str, Any]:
@@ -53,6 +56,7 @@ class ConfigManager:
         else:
             logger.info("Пользовательский конфиг не найден, используются настройки по умолчанию")
         
+        self._notify(None)
         return self.config
     
     def save_user_config(self, config: Dict[str, Any] = None):
@@ -64,6 +68,7 @@ class ConfigManager:
         """
         if config is not None:
             self.config = config
+            self._notify(None)
         
         # Создаём директорию если нужно
         self.user_config_path.parent.mkdir(parents=True, exist_ok=True)
@@ -113,6 +118,25 @@ class ConfigManager:
         
         config[keys[-1]] = value
         logger.debug(f"Установлено значение '{key_path}' = {value}")
+        self._notify(key_path)
+    
+    def add_change_listener(self, callback: Callable[[Optional[str]], None]):
+        """
+        Подписаться на изменения конфига
+        
+        Args:
+            callback: Функция callback(key_path); key_path = None после загрузки/замены всего конфига
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+    
+    def _notify(self, key_path: Optional[str]):
+        """Оповестить подписчиков об изменении"""
+        for callback in self._listeners:
+            try:
+                callback(key_path)
+            except Exception as e:
+                logger.error(f"Ошибка в подписчике конфига: {e}")
     
     def _merge_configs(self, base: Dict, update: Dict):
         """
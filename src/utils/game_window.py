@@ -0,0 +1,33 @@
+"""
+Поиск окна игры
+Один список заголовков для всех модулей (трекер, триггер-бот, автопрыжок)
+"""
+
+from typing import Optional
+
+try:
+    import win32gui
+    WIN32_AVAILABLE = True
+except ImportError:
+    WIN32_AVAILABLE = False
+
+
+# Заголовки окна игры (в порядке проверки)
+GAME_WINDOW_TITLES = ("Pixel Gun 3D", "Pixel Gun 3D - Unity")
+
+
+def find_game_window() -> Optional[int]:
+    """
+    Найти окно игры
+
+    Returns:
+        HWND окна игры или None
+    """
+    if not WIN32_AVAILABLE:
+        return None
+
+    for title in GAME_WINDOW_TITLES:
+        hwnd = win32gui.FindWindow(None, title)
+        if hwnd:
+            return hwnd
+    return None
@@ -0,0 +1,78 @@
+"""
+Общий опрос ввода за один тик
+Один проход GetAsyncKeyState по всем отслеживаемым клавишам
+и один GetForegroundWindow на тик для всех подписчиков
+"""
+
+from typing import Callable, Dict, List, Optional
+from loguru import logger
+
+try:
+    import win32api
+    import win32gui
+    WIN32_AVAILABLE = True
+except ImportError:
+    WIN32_AVAILABLE = False
+
+
+class InputState:
+    """
+    Диспетчер опроса клавиатуры
+
+    Подписчики получают callback(keys, foreground):
+        keys: {vk_code: нажата ли клавиша} для отслеживаемых клавиш
+        foreground: HWND активного окна или None, если клавиши не отслеживаются
+    """
+
+    def __init__(self):
+        """Инициализация"""
+        self._tracked: Dict[int, int] = {}  # vk_code -> количество запросов
+        self._subs: List[Callable[[Dict[int, bool], Optional[int]], None]] = []
+        self.keys: Dict[int, bool] = {}
+        self.foreground: Optional[int] = None
+
+    def subscribe(self, callback: Callable[[Dict[int, bool], Optional[int]], None]):
+        """
+        Подписаться на результаты опроса
+
+        Args:
+            callback: Функция callback(keys, foreground)
+        """
+        if callback not in self._subs:
+            self._subs.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict[int, bool], Optional[int]], None]):
+        """Отписаться от результатов опроса"""
+        if callback in self._subs:
+            self._subs.remove(callback)
+
+    def track(self, vk_code: int):
+        """Начать опрашивать клавишу"""
+        self._tracked[vk_code] = self._tracked.get(vk_code, 0) + 1
+
+    def untrack(self, vk_code: int):
+        """Перестать опрашивать клавишу"""
+        count = self._tracked.get(vk_code, 0) - 1
+        if count > 0:
+            self._tracked[vk_code] = count
+        else:
+            self._tracked.pop(vk_code, None)
+
+    def poll(self):
+        """Опросить клавиатуру и разослать результат подписчикам (раз за тик)"""
+        if self._tracked and WIN32_AVAILABLE:
+            get_key = win32api.GetAsyncKeyState
+            self.keys = {vk: (get_key(vk) & 0x8000) != 0 for vk in self._tracked}
+            self.foreground = win32gui.GetForegroundWindow()
+        else:
+            # Никто не опрашивает клавиши (например, работает хук) - без вызовов WinAPI
+            self.keys = {}
+            self.foreground = None
+
+        keys = self.keys
+        foreground = self.foreground
+        for callback in self._subs:
+            try:
+                callback(keys, foreground)
+            except Exception as e:
+                logger.error(f"Ошибка в подписчике InputState: {e}")
@@ -0,0 +1,150 @@
+"""
+Низкоуровневый хук клавиатуры (WH_KEYBOARD_LL)
+События нажатий приходят от ОС, без опроса GetAsyncKeyState каждый тик
+"""
+
+import ctypes
+import threading
+from ctypes import wintypes
+from typing import Callable, Optional
+from loguru import logger
+
+try:
+    _user32 = ctypes.WinDLL('user32', use_last_error=True)
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    HOOK_AVAILABLE = True
+except (AttributeError, OSError):
+    _user32 = None
+    _kernel32 = None
+    HOOK_AVAILABLE = False
+
+
+# Константы WinAPI
+WH_KEYBOARD_LL = 13
+HC_ACTION = 0
+WM_QUIT = 0x0012
+WM_KEYDOWN = 0x0100
+WM_KEYUP = 0x0101
+WM_SYSKEYDOWN = 0x0104
+WM_SYSKEYUP = 0x0105
+LLKHF_INJECTED = 0x10
+
+
+class KBDLLHOOKSTRUCT(ctypes.Structure):
+    _fields_ = [
+        ('vkCode', wintypes.DWORD),
+        ('scanCode', wintypes.DWORD),
+        ('flags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t),
+    ]
+
+
+if HOOK_AVAILABLE:
+    LRESULT = ctypes.c_ssize_t
+    _HOOKPROC = ctypes.WINFUNCTYPE(LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+
+    _user32.SetWindowsHookExW.argtypes = (ctypes.c_int, _HOOKPROC, wintypes.HINSTANCE, wintypes.DWORD)
+    _user32.SetWindowsHookExW.restype = wintypes.HHOOK
+    _user32.CallNextHookEx.argtypes = (wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+    _user32.CallNextHookEx.restype = LRESULT
+    _user32.UnhookWindowsHookEx.argtypes = (wintypes.HHOOK,)
+    _user32.GetMessageW.argtypes = (ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT)
+    _user32.PostThreadMessageW.argtypes = (wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+    _kernel32.GetModuleHandleW.argtypes = (wintypes.LPCWSTR,)
+    _kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+
+
+class KeyboardHook:
+    """
+    Глобальный хук клавиатуры в отдельном потоке
+
+    Callback вызывается из потока хука для каждого физического
+    (не сгенерированного SendInput) нажатия/отпускания клавиши.
+    Callback должен быть быстрым - ОС ждёт возврата из хука.
+    """
+
+    def __init__(self, callback: Callable[[int, bool], None]):
+        """
+        Инициализация хука
+
+        Args:
+            callback: Функция callback(vk_code, is_down)
+        """
+        self._callback = callback
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = None
+        self._started = threading.Event()
+        self._installed = False
+        # Ссылку на ctypes-callback держим, иначе GC соберёт его под хуком
+        self._proc = _HOOKPROC(self._hook_proc) if HOOK_AVAILABLE else None
+
+    def is_running(self) -> bool:
+        """Установлен ли хук"""
+        return self._installed
+
+    def start(self) -> bool:
+        """
+        Установить хук и запустить цикл сообщений
+
+        Returns:
+            True если хук установлен
+        """
+        if not HOOK_AVAILABLE:
+            return False
+
+        if self._installed:
+            return True
+
+        self._started.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._started.wait(timeout=1.0)
+        return self._installed
+
+    def stop(self):
+        """Снять хук и завершить поток"""
+        if self._thread_id is not None:
+            _user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        self._thread_id = None
+
+    def _run(self):
+        """Поток хука: установка и цикл сообщений"""
+        self._thread_id = _kernel32.GetCurrentThreadId()
+        hook = _user32.SetWindowsHookExW(WH_KEYBOARD_LL, self._proc, _kernel32.GetModuleHandleW(None), 0)
+
+        if not hook:
+            logger.error(f"Не удалось установить хук клавиатуры (ошибка {ctypes.get_last_error()})")
+            self._thread_id = None
+            self._started.set()
+            return
+
+        self._installed = True
+        self._started.set()
+
+        try:
+            msg = wintypes.MSG()
+            while _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                pass
+        finally:
+            _user32.UnhookWindowsHookEx(hook)
+            self._installed = False
+
+    def _hook_proc(self, n_code, w_param, l_param):
+        """Обработчик WH_KEYBOARD_LL"""
+        if n_code == HC_ACTION:
+            kb = ctypes.cast(l_param, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
+            # Свои же нажатия (SendInput) не обрабатываем
+            if not kb.flags & LLKHF_INJECTED:
+                try:
+                    if w_param in (WM_KEYDOWN, WM_SYSKEYDOWN):
+                        self._callback(kb.vkCode, True)
+                    elif w_param in (WM_KEYUP, WM_SYSKEYUP):
+                        self._callback(kb.vkCode, False)
+                except Exception as e:
+                    logger.error(f"Ошибка в обработчике хука клавиатуры: {e}")
+
+        return _user32.CallNextHookEx(None, n_code, w_param, l_param)
@@ -48,6 +48,21 @@ def setup_logger(log_level: str = "INFO", log_to_file: bool = True, log_file: st
     return logger
 
 
+def is_level_enabled(level: str) -> bool:
+    """
+    Пропустит ли логгер сообщения этого уровня хоть в один обработчик
+    
+    Нужно, чтобы не собирать f-строки для отфильтрованных сообщений в горячих местах.
+    
+    Args:
+        level: Уровень логирования (DEBUG, INFO, ...)
+    """
+    try:
+        return logger.level(level).no >= logger._core.min_level
+    except (AttributeError, ValueError):
+        return True
+
+
 def get_logger():
     """Получить экземпляр логгера"""
     return logger
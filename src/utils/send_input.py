@@ -0,0 +1,211 @@
+"""
+Прямой ввод через WinAPI SendInput
+Заранее собранные INPUT-структуры для клавиатуры и мыши
+"""
+
+import ctypes
+from ctypes import wintypes
+from typing import Optional, Tuple
+from loguru import logger
+
+try:
+    _user32 = ctypes.WinDLL('user32', use_last_error=True)
+    SEND_INPUT_AVAILABLE = True
+except (AttributeError, OSError):
+    _user32 = None
+    SEND_INPUT_AVAILABLE = False
+
+
+# Константы WinAPI
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_SCANCODE = 0x0008
+MOUSEEVENTF_LEFTDOWN = 0x0002
+MOUSEEVENTF_LEFTUP = 0x0004
+MAPVK_VK_TO_VSC = 0
+
+# Виртуальные коды именованных клавиш (имена как в библиотеке keyboard)
+_NAMED_KEYS = {
+    'space': 0x20,
+    'enter': 0x0D,
+    'tab': 0x09,
+    'shift': 0x10,
+    'ctrl': 0x11,
+    'alt': 0x12,
+    'esc': 0x1B,
+    'escape': 0x1B,
+}
+
+ULONG_PTR = ctypes.c_size_t
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ('dx', wintypes.LONG),
+        ('dy', wintypes.LONG),
+        ('mouseData', wintypes.DWORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ULONG_PTR),
+    ]
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ('wVk', wintypes.WORD),
+        ('wScan', wintypes.WORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ULONG_PTR),
+    ]
+
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ('uMsg', wintypes.DWORD),
+        ('wParamL', wintypes.WORD),
+        ('wParamH', wintypes.WORD),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [
+        ('mi', MOUSEINPUT),
+        ('ki', KEYBDINPUT),
+        ('hi', HARDWAREINPUT),
+    ]
+
+
+class INPUT(ctypes.Structure):
+    _anonymous_ = ('u',)
+    _fields_ = [
+        ('type', wintypes.DWORD),
+        ('u', _INPUTUNION),
+    ]
+
+
+INPUT_SIZE = ctypes.sizeof(INPUT)
+
+if SEND_INPUT_AVAILABLE:
+    _user32.SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
+    _user32.SendInput.restype = wintypes.UINT
+    # VkKeyScanW возвращает SHORT: -1 - символа нет, старший байт - нужные модификаторы
+    _user32.VkKeyScanW.argtypes = (ctypes.c_wchar,)
+    _user32.VkKeyScanW.restype = ctypes.c_short
+
+
+def key_to_vk(key: str) -> Optional[int]:
+    """
+    Получить виртуальный код клавиши по имени
+
+    Args:
+        key: Имя клавиши ('space', '1', 'f', 'F5' ...)
+
+    Returns:
+        VK код или None если клавиша не распознана
+    """
+    if not SEND_INPUT_AVAILABLE or not key:
+        return None
+
+    name = key.lower()
+    if name in _NAMED_KEYS:
+        return _NAMED_KEYS[name]
+
+    # F1-F24
+    if name[0] == 'f' and name[1:].isdigit() and 1 <= int(name[1:]) <= 24:
+        return 0x6F + int(name[1:])
+
+    if len(key) == 1:
+        vk = _user32.VkKeyScanW(key)
+        # Символы, требующие Shift/Ctrl/Alt, голым скан-кодом не отправить - их обработает keyboard
+        if vk != -1 and not vk & 0xFF00:
+            return vk & 0xFF
+
+    return None
+
+
+def make_key_inputs(key: str) -> Optional[Tuple[INPUT, INPUT]]:
+    """
+    Собрать пару INPUT (нажатие, отпускание) по скан-коду клавиши
+
+    Args:
+        key: Имя клавиши
+
+    Returns:
+        Tuple(down, up) или None если SendInput недоступен / клавиша не распознана
+    """
+    vk = key_to_vk(key)
+    if vk is None:
+        return None
+
+    scan = _user32.MapVirtualKeyW(vk, MAPVK_VK_TO_VSC)
+    if not scan:
+        logger.debug(f"Нет скан-кода для клавиши '{key}'")
+        return None
+
+    down = INPUT(type=INPUT_KEYBOARD)
+    down.ki = KEYBDINPUT(0, scan, KEYEVENTF_SCANCODE, 0, 0)
+
+    up = INPUT(type=INPUT_KEYBOARD)
+    up.ki = KEYBDINPUT(0, scan, KEYEVENTF_SCANCODE | KEYEVENTF_KEYUP, 0, 0)
+
+    return down, up
+
+
+def make_mouse_inputs() -> Optional[Tuple[INPUT, INPUT]]:
+    """
+    Собрать пару INPUT (нажатие, отпускание) левой кнопки мыши
+
+    Returns:
+        Tuple(down, up) или None если SendInput недоступен
+    """
+    if not SEND_INPUT_AVAILABLE:
+        return None
+
+    down = INPUT(type=INPUT_MOUSE)
+    down.mi = MOUSEINPUT(0, 0, 0, MOUSEEVENTF_LEFTDOWN, 0, 0)
+
+    up = INPUT(type=INPUT_MOUSE)
+    up.mi = MOUSEINPUT(0, 0, 0, MOUSEEVENTF_LEFTUP, 0, 0)
+
+    return down, up
+
+
+def make_input_array(*inputs: INPUT):
+    """
+    Собрать массив INPUT для одного вызова SendInput
+
+    Args:
+        inputs: Структуры INPUT в порядке отправки
+
+    Returns:
+        ctypes-массив INPUT
+    """
+    return (INPUT * len(inputs))(*inputs)
+
+
+def send_inputs(inputs) -> int:
+    """
+    Отправить массив событий одним системным вызовом (ОС вставляет их подряд)
+
+    Args:
+        inputs: Массив из make_input_array
+
+    Returns:
+        Количество отправленных событий (0 при ошибке)
+    """
+    return _user32.SendInput(len(inputs), inputs, INPUT_SIZE)
+
+
+def send_input(inp: INPUT) -> int:
+    """
+    Отправить одно событие ввода
+
+    Args:
+        inp: Заранее собранная структура INPUT
+
+    Returns:
+        Количество отправленных событий (0 при ошибке)
+    """
+    return _user32.SendInput(1, ctypes.byref(inp), INPUT_SIZE)
@@ -0,0 +1,27 @@
+"""
+Тесты загрузки шаблонов WeaponDetector
+"""
+
+import cv2
+import numpy as np
+
+from src.core.weapon_detector import WeaponDetector, TEMPLATE_SIZE
+
+
+def test_mismatched_npy_cache_is_rebuilt_from_png(tmp_path):
+    """Кэш .npy другого размера не ломает загрузку: шаблон берётся из PNG, кэш перезаписывается"""
+    icon = np.random.default_rng(0).integers(0, 256, (64, 64, 3), dtype=np.uint8)
+    detector = WeaponDetector(str(tmp_path))
+    detector.add_weapon('ak', 'AK', 1, 90, 30, icon)
+
+    # Подкладываем кэш неподходящего размера, новее PNG
+    cache_path = tmp_path / 'ak.npy'
+    np.save(cache_path, np.zeros((32, 32, 3), dtype=np.uint8))
+
+    reloaded = WeaponDetector(str(tmp_path))
+
+    expected_shape = (TEMPLATE_SIZE[1], TEMPLATE_SIZE[0], 3)
+    assert reloaded.templates['ak'].shape == expected_shape
+    assert np.array_equal(reloaded.templates['ak'], cv2.cvtColor(cv2.imread(str(tmp_path / 'ak.png')), cv2.COLOR_BGR2RGB))
+    assert np.load(cache_path).shape == expected_shape
+    assert reloaded.detect_weapon(icon)['id'] == 'ak'